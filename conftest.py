@@ -0,0 +1,39 @@
+"""
+Shared pytest setup for the smoke-check scripts and the unit tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--integration", action="store_true", default=False,
+        help="run checks that call the live ENTSOE API or a real database"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "integration: needs the live ENTSOE API or a real database")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip integration checks unless --integration is given."""
+    if config.getoption("--integration"):
+        return
+    skip = pytest.mark.skip(reason="needs --integration")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def settings():
+    """Application settings, loaded once per test session."""
+    from config import settings
+    return settings
@@ -1,18 +1,21 @@
 """
 Databricks initialization script for ENTSOE ETL pipeline.
-Run this script to initialize and test the Databricks environment.
+Run this script to initialize the Databricks environment.
+Pass --verify to also test imports, configuration and database connectivity.
 """
 
+import argparse
+import importlib.metadata
+import importlib.util
 import os
 import sys
-import logging
 from datetime import datetime
 
-# Add current directory to path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Add src directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
 
-def setup_databricks_environment():
-    """Set up Databricks environment and test configuration."""
+def show_environment():
+    """Show which environment the pipeline is running in."""
     
     print("=" * 60)
     print("ENTSOE ETL Pipeline - Databricks Environment Setup")
@@ -32,42 +35,29 @@ def setup_databricks_environment():
         print(f"  - Cluster ID: {os.environ.get('DATABRICKS_CLUSTER_ID', 'Unknown')}")
     else:
         print("⚠ Running in local environment (not Databricks)")
+
+
+def setup_databricks_environment():
+    """Set up Databricks environment and test configuration."""
     
-    # Test imports
-    print("\nTesting imports...")
-    try:
-        import requests
-        print("✓ requests imported successfully")
-    except ImportError as e:
-        print(f"✗ Failed to import requests: {e}")
-        return False
-    
-    try:
-        import pandas as pd
-        print("✓ pandas imported successfully")
-        print(f"  - Version: {pd.__version__}")
-    except ImportError as e:
-        print(f"✗ Failed to import pandas: {e}")
-        return False
-    
-    try:
-        import psycopg2
-        print("✓ psycopg2 imported successfully")
-    except ImportError as e:
-        print(f"✗ Failed to import psycopg2: {e}")
-        return False
+    show_environment()
     
-    try:
-        import xmltodict
-        print("✓ xmltodict imported successfully")
-    except ImportError as e:
-        print(f"✗ Failed to import xmltodict: {e}")
-        return False
+    # Test imports; find_spec checks presence without running each
+    # package's import-time code
+    print("\nTesting imports...")
+    for module in ('requests', 'pandas', 'psycopg2', 'lxml'):
+        if importlib.util.find_spec(module) is None:
+            print(f"✗ {module} is not installed")
+            return False
+        print(f"✓ {module} found")
+        if module == 'pandas':
+            print(f"  - Version: {importlib.metadata.version('pandas')}")
     
     # Test configuration
     print("\nTesting configuration...")
     try:
-        from config import settings
+        from config import get_settings
+        settings = get_settings()
         print("✓ Configuration loaded successfully")
         print(f"  - API Base URL: {settings.entsoe_base_url}")
         print(f"  - Country EIC: {settings.country_eic}")
@@ -102,8 +92,8 @@ def setup_databricks_environment():
     # Test database connection
     print("\nTesting database connection...")
     try:
-        from load import DatabaseLoader
-        loader = DatabaseLoader()
+        from postgres_writer import PostgresWriter
+        loader = PostgresWriter()
         if loader.test_connection():
             print("✓ Database connection successful")
         else:
@@ -137,6 +127,9 @@ def show_usage_examples():
     print("USAGE EXAMPLES")
     print("=" * 60)
     
+    print("\n0. Verify environment (imports, configuration, database):")
+    print("   python databricks_init.py --verify")
+    
     print("\n1. Run daily ETL (yesterday's data):")
     print("   python main.py --mode daily")
     
@@ -157,6 +150,21 @@ def show_usage_examples():
 
 def main():
     """Main function for Databricks initialization."""
+    parser = argparse.ArgumentParser(description="ENTSOE ETL Databricks initialization")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Test imports, configuration, API client and database connection"
+    )
+    
+    args = parser.parse_args()
+    
+    # Skip the import and connection probes unless explicitly requested
+    if not args.verify:
+        show_environment()
+        show_usage_examples()
+        print(f"\nInitialization completed at: {datetime.now()}")
+        return 0
     
     success = setup_databricks_environment()
     
@@ -28,7 +28,8 @@ def demo_pipeline_components():
         # 1. Configuration
         print("\n1. CONFIGURATION")
         print("-" * 30)
-        from config import settings, get_country_info
+        from config import get_settings, get_country_info
+        settings = get_settings()
         print(f"✓ API Base URL: {settings.entsoe_base_url}")
         print(f"✓ Country: {get_country_info()['name']}")
         print(f"✓ Log Level: {settings.log_level}")
@@ -6,15 +6,19 @@ Updated for new src/ structure and Databricks-friendly ETL pipeline.
 
 import argparse
 import logging
+import multiprocessing
 import sys
 import os
-from datetime import datetime, timezone
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from config import settings, get_country_info, get_databricks_info
+from config import get_settings, get_country_info, get_all_countries, get_databricks_info
 from utils import setup_logging, get_date_range, parse_date_argument
 from entsoe_api import ENTSOEAPIClient
 from transform import DataTransformer
@@ -25,25 +29,27 @@ class ENTSOEETLPipeline:
     """Main ETL pipeline orchestrator."""
     
     def __init__(self, country_code: str = None):
-        self.logger = setup_logging(settings.log_level)
+        self.logger = setup_logging(get_settings().log_level)
         self.country_info = get_country_info(country_code)
         self.api_client = ENTSOEAPIClient(country_code=self.country_info['code'])
         self.transformer = DataTransformer()
         self.loader = PostgresWriter()
         
         # Log Databricks environment info
-        if settings.is_databricks:
+        if get_settings().is_databricks:
             self.logger.info("Running in Databricks environment")
             databricks_info = get_databricks_info()
             self.logger.info(f"Databricks info: {databricks_info}")
     
-    def run_historical_etl(self, start_date: str = None, end_date: Optional[str] = None) -> bool:
+    def run_historical_etl(self, start_date: str = None, end_date: Optional[str] = None,
+                           analyze: bool = True) -> bool:
         """
         Run ETL pipeline for historical data.
         
         Args:
             start_date: Start date in YYYY-MM-DD format (defaults to config default)
             end_date: End date in YYYY-MM-DD format (defaults to today)
+            analyze: Refresh table statistics after loading
         
         Returns:
             True if successful, False otherwise
@@ -51,7 +57,7 @@ class ENTSOEETLPipeline:
         try:
             # Set default start date if not provided
             if start_date is None:
-                start_date = settings.default_start_date
+                start_date = get_settings().default_start_date
             
             # Set end date to today if not provided
             if end_date is None:
@@ -68,22 +74,72 @@ class ENTSOEETLPipeline:
             if not self._initialize_database():
                 return False
             
-            # Process each date
+            # Extract and transform dates concurrently, then load the whole
+            # range at once. Day-ahead prices come back for the whole range
+            # in one request, so the per-date workers only fetch balancing
+            # reserves. The workers hand their API calls to the client's
+            # request pool, so MAX_CONCURRENT_REQUESTS bounds in-flight
+            # requests whatever ETL_PARALLELISM is
             success_count = 0
             error_count = 0
+            br_frames = {}
+            dap_frames = []
             
-            for date in dates:
-                try:
-                    self.logger.info(f"Processing date: {date.strftime('%Y-%m-%d')}")
-                    
-                    if self._process_single_date(date):
-                        success_count += 1
-                    else:
+            max_workers = max(1, min(get_settings().etl_parallelism, len(dates)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                prices_future = executor.submit(self._extract_and_transform_prices, dates[0], dates[-1]) if dates else None
+                futures = {
+                    executor.submit(self._extract_and_transform, date, include_prices=False): date
+                    for date in dates
+                }
+                
+                if prices_future is not None:
+                    dap_df = prices_future.result()
+                    if dap_df is None:
                         error_count += 1
+                    elif not dap_df.empty:
+                        dap_frames.append(dap_df)
+                
+                for future in as_completed(futures):
+                    date = futures[future]
+                    try:
+                        frames = future.result()
+                        if frames is None:
+                            error_count += 1
+                            continue
                         
-                except Exception as e:
-                    self.logger.error(f"Error processing date {date.strftime('%Y-%m-%d')}: {e}")
-                    error_count += 1
+                        br_df, _ = frames
+                        if not br_df.empty:
+                            br_frames[date] = br_df
+                        self._log_processing_summary(date, br_df)
+                        success_count += 1
+                            
+                    except Exception as e:
+                        self.logger.error(f"Error processing date {date.strftime('%Y-%m-%d')}: {e}")
+                        error_count += 1
+            
+            # One write per table for the whole range; a range with no
+            # rows loaded yet is COPYed in directly instead of merged.
+            # Adjacent daily responses share their boundary rows, and one
+            # batch may hold each key only once (a COPY would hit the
+            # unique index, an upsert cannot touch a row twice), so the
+            # days are stacked in date order and the later copy kept
+            br_all = pd.DataFrame()
+            if br_frames:
+                br_all = pd.concat([br_frames[date] for date in sorted(br_frames)], ignore_index=True)
+                br_all = br_all.drop_duplicates(subset=['country_code', 'datetime_utc', 'reserve_type'],
+                                                keep='last', ignore_index=True)
+            dap_all = pd.concat(dap_frames, ignore_index=True) if dap_frames else pd.DataFrame()
+            mode = 'upsert' if self._has_existing_rows(br_all, dap_all) else 'append'
+            self.logger.info(f"Loading historical range in {mode} mode")
+            if not self._load_data(br_all, dap_all, mode=mode):
+                self.logger.error("Historical ETL failed to load data")
+                return False
+            
+            # A bulk load skews the planner's row estimates until the next
+            # autovacuum pass; refresh them now
+            if analyze:
+                self.loader.analyze_tables()
             
             # Log final statistics
             self.logger.info(f"Historical ETL completed. Success: {success_count}, Errors: {error_count}")
@@ -169,59 +225,175 @@ class ENTSOEETLPipeline:
             True if successful, False otherwise
         """
         try:
+            frames = self._extract_and_transform(date)
+            if frames is None:
+                return False
+            
+            balancing_reserves_df, day_ahead_prices_df = frames
+            
+            # Load data
+            if not self._load_data(balancing_reserves_df, day_ahead_prices_df):
+                return False
+            
+            # Log summary
+            self._log_processing_summary(date, balancing_reserves_df, day_ahead_prices_df)
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error processing date {date.strftime('%Y-%m-%d')}: {e}")
+            return False
+    
+    def _extract_and_transform(self, date: datetime,
+                               include_prices: bool = True) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Extract and transform data for a single date.
+        
+        Args:
+            date: Date to process
+            include_prices: Also fetch day-ahead prices; when False an empty
+                prices frame is returned
+        
+        Returns:
+            Tuple of (balancing_reserves_df, day_ahead_prices_df), or None if
+            extraction or validation failed
+        """
+        try:
+            self.logger.info(f"Processing date: {date.strftime('%Y-%m-%d')}")
+            
             # Extract data
-            balancing_reserves_df = self.api_client.get_balancing_reserves(date)
-            day_ahead_prices_df = self.api_client.get_day_ahead_prices(date)
+            if include_prices:
+                balancing_reserves_df, day_ahead_prices_df = self.api_client.get_day(date)
+            else:
+                # Fetch through the client's request pool; it bounds the
+                # requests in flight across all ETL workers
+                balancing_reserves_df = self.api_client.executor.submit(
+                    self.api_client.get_balancing_reserves, date
+                ).result()
+                day_ahead_prices_df = pd.DataFrame()
             
             # Transform data
             if not balancing_reserves_df.empty:
                 balancing_reserves_df = self.transformer.transform_balancing_reserves(balancing_reserves_df)
                 if not self.transformer.validate_transformed_data(balancing_reserves_df, 'balancing_reserves'):
                     self.logger.error("Balancing reserves data validation failed")
-                    return False
+                    return None
             
             if not day_ahead_prices_df.empty:
                 day_ahead_prices_df = self.transformer.transform_day_ahead_prices(day_ahead_prices_df)
                 if not self.transformer.validate_transformed_data(day_ahead_prices_df, 'day_ahead_prices'):
                     self.logger.error("Day-ahead prices data validation failed")
-                    return False
+                    return None
             
-            # Load data
-            br_success = self.loader.write_balancing_reserves(balancing_reserves_df)
-            dap_success = self.loader.write_day_ahead_prices(day_ahead_prices_df)
+            return balancing_reserves_df, day_ahead_prices_df
             
-            if not br_success or not dap_success:
-                self.logger.error("Data loading failed")
-                return False
+        except Exception as e:
+            self.logger.error(f"Error processing date {date.strftime('%Y-%m-%d')}: {e}")
+            return None
+    
+    def _extract_and_transform_prices(self, start: datetime, end: datetime) -> Optional[pd.DataFrame]:
+        """
+        Extract and transform day-ahead prices for a whole date range.
+        
+        Args:
+            start: First date to process
+            end: Last date to process, inclusive
+        
+        Returns:
+            Day-ahead prices DataFrame, or None if extraction or validation failed
+        """
+        try:
+            # Fetch through the client's request pool, like the per-date workers
+            day_ahead_prices_df = self.api_client.executor.submit(
+                self.api_client.get_day_ahead_prices_range, start, end
+            ).result()
             
-            # Log summary
-            self._log_processing_summary(date, balancing_reserves_df, day_ahead_prices_df)
+            if not day_ahead_prices_df.empty:
+                day_ahead_prices_df = self.transformer.transform_day_ahead_prices(day_ahead_prices_df)
+                if not self.transformer.validate_transformed_data(day_ahead_prices_df, 'day_ahead_prices'):
+                    self.logger.error("Day-ahead prices data validation failed")
+                    return None
             
-            return True
+            self.logger.info(f"  - Day-ahead prices: {len(day_ahead_prices_df)} records "
+                             f"from {start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')}")
+            return day_ahead_prices_df
             
         except Exception as e:
-            self.logger.error(f"Error processing date {date.strftime('%Y-%m-%d')}: {e}")
+            self.logger.error(f"Error processing day-ahead prices from {start.strftime('%Y-%m-%d')} "
+                              f"to {end.strftime('%Y-%m-%d')}: {e}")
+            return None
+    
+    def _load_data(self, br_df: pd.DataFrame, dap_df: pd.DataFrame, mode: str = 'upsert') -> bool:
+        """
+        Load transformed data into the database.
+        
+        Args:
+            br_df: Balancing reserves DataFrame
+            dap_df: Day-ahead prices DataFrame
+            mode: Write mode passed to the loader ('upsert' or 'append')
+        
+        Returns:
+            True if both writes succeeded, False otherwise
+        """
+        # The tables are independent, so both writes run at once on their
+        # own pooled connections
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            br_future = executor.submit(self.loader.write_balancing_reserves, br_df, mode=mode)
+            dap_future = executor.submit(self.loader.write_day_ahead_prices, dap_df, mode=mode)
+            br_success = br_future.result()
+            dap_success = dap_future.result()
+        
+        if not br_success or not dap_success:
+            self.logger.error("Data loading failed")
             return False
+        
+        return True
+    
+    def _has_existing_rows(self, br_df: pd.DataFrame, dap_df: pd.DataFrame) -> bool:
+        """
+        Check whether any table already holds rows in the frames' time span.
+        
+        Args:
+            br_df: Balancing reserves DataFrame
+            dap_df: Day-ahead prices DataFrame
+        
+        Returns:
+            True if an upsert is needed, False if the rows can be appended
+        """
+        country_code = self.country_info['code']
+        for table, df in (('balancing_reserves', br_df), ('day_ahead_prices', dap_df)):
+            if df.empty:
+                continue
+            start = df['datetime_utc'].min().to_pydatetime()
+            end = df['datetime_utc'].max().to_pydatetime()
+            if self.loader.has_rows_between(table, country_code, start, end):
+                return True
+        return False
     
-    def _log_processing_summary(self, date: datetime, br_df, dap_df):
+    def _log_processing_summary(self, date: datetime, br_df, dap_df=None):
         """
         Log summary of processed data.
         
         Args:
             date: Processed date
             br_df: Balancing reserves DataFrame
-            dap_df: Day-ahead prices DataFrame
+            dap_df: Day-ahead prices DataFrame, or None if logged separately
         """
+        # Summaries scan both frames; skip them when INFO is filtered out
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(f"Processing summary for {date.strftime('%Y-%m-%d')}:")
         self.logger.info(f"  - Balancing reserves: {len(br_df)} records")
-        self.logger.info(f"  - Day-ahead prices: {len(dap_df)} records")
+        if dap_df is not None:
+            self.logger.info(f"  - Day-ahead prices: {len(dap_df)} records")
         
         # Log data summaries if available
         if not br_df.empty:
             br_summary = self.transformer.get_data_summary(br_df, 'balancing_reserves')
             self.logger.info(f"  - BR summary: {br_summary}")
         
-        if not dap_df.empty:
+        if dap_df is not None and not dap_df.empty:
             dap_summary = self.transformer.get_data_summary(dap_df, 'day_ahead_prices')
             self.logger.info(f"  - DAP summary: {dap_summary}")
     
@@ -239,11 +411,104 @@ class ENTSOEETLPipeline:
         """Clean up resources."""
         try:
             self.loader.close_connection()
+            self.api_client.close_session()
             self.logger.info("Cleanup completed")
         except Exception as e:
             self.logger.error(f"Cleanup failed: {e}")
 
 
+def run_historical_etl_for_country(country_code: str, start_date: Optional[str] = None,
+                                   end_date: Optional[str] = None, analyze: bool = True) -> bool:
+    """
+    Run the historical ETL for one country with its own pipeline.
+    Module-level so that worker processes can run it.
+    
+    Args:
+        country_code: Country code (e.g., 'DE')
+        start_date: Start date in YYYY-MM-DD format (defaults to config default)
+        end_date: End date in YYYY-MM-DD format (defaults to today)
+        analyze: Refresh table statistics after loading
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    pipeline = ENTSOEETLPipeline(country_code=country_code)
+    try:
+        return pipeline.run_historical_etl(start_date, end_date, analyze=analyze)
+    finally:
+        pipeline.cleanup()
+
+
+def run_historical_etl_all_countries(start_date: Optional[str] = None, end_date: Optional[str] = None,
+                                     countries: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+    """
+    Run the historical ETL for several countries in parallel worker processes.
+    Countries share no rows, so each worker has its own API client, DataFrames
+    and database connections.
+    
+    Args:
+        start_date: Start date in YYYY-MM-DD format (defaults to config default)
+        end_date: End date in YYYY-MM-DD format (defaults to today)
+        countries: Country codes to process (defaults to every configured country)
+    
+    Returns:
+        Dictionary mapping country code to success
+    """
+    logger = logging.getLogger("entsoe_etl")
+    settings = get_settings()
+    countries = list(countries) if countries else list(get_all_countries())
+    if start_date is None:
+        start_date = settings.default_start_date
+    if end_date is None:
+        end_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    
+    # Create the schema and partitions once up front, so workers never race
+    # on the same DDL
+    loader = PostgresWriter()
+    try:
+        if not loader.create_tables():
+            logger.error("Failed to create database tables")
+            return {country: False for country in countries}
+        start = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        end = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc) + timedelta(days=1)
+        for table in ('balancing_reserves', 'day_ahead_prices'):
+            loader.ensure_partitions(table, start, end)
+    finally:
+        loader.close_connection()
+    
+    # Each worker holds its own connection pool, so the process count also
+    # bounds the connections opened against the database
+    max_workers = max(1, min(settings.country_parallelism, len(countries), os.cpu_count() or 1))
+    logger.info(f"Running historical ETL for {len(countries)} countries with {max_workers} workers")
+    
+    results = {}
+    # Spawned workers start clean instead of inheriting this process's
+    # threads and open connections
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {
+            executor.submit(run_historical_etl_for_country, country, start_date, end_date, False): country
+            for country in countries
+        }
+        for future in as_completed(futures):
+            country = futures[future]
+            try:
+                results[country] = future.result()
+            except Exception as e:
+                logger.error(f"Historical ETL failed for {country}: {e}")
+                results[country] = False
+            logger.info(f"Historical ETL for {country}: {'succeeded' if results[country] else 'failed'}")
+    
+    # One statistics refresh after every worker has loaded
+    loader = PostgresWriter()
+    try:
+        loader.analyze_tables()
+    finally:
+        loader.close_connection()
+    
+    return results
+
+
 def main():
     """Main entry point for the ETL pipeline."""
     parser = argparse.ArgumentParser(description="ENTSOE ETL Pipeline")
@@ -273,9 +538,21 @@ def main():
         type=str,
         help="Country code (e.g., DE, FR, IT). Defaults to DE"
     )
+    parser.add_argument(
+        "--all-countries",
+        action="store_true",
+        help="Historical mode only: process every configured country in parallel"
+    )
     
     args = parser.parse_args()
     
+    if args.all_countries:
+        if args.mode != "historical":
+            parser.error("--all-countries requires --mode historical")
+        setup_logging(get_settings().log_level)
+        results = run_historical_etl_all_countries(args.start_date, args.end_date)
+        sys.exit(0 if all(results.values()) else 1)
+    
     # Create pipeline instance
     pipeline = ENTSOEETLPipeline(country_code=args.country)
     
@@ -202,29 +202,39 @@ print("=" * 60)
 try:
     # Query recent data
     import pandas as pd
+    from sqlalchemy import text
+    
+    # The test date covers [00:00, 24:00) UTC; a range on datetime_utc can use its index
+    day_start = datetime.strptime(test_date, '%Y-%m-%d')
+    params = {'start': f"{test_date} 00:00:00+00", 'end': f"{(day_start + timedelta(days=1)):%Y-%m-%d} 00:00:00+00"}
     
     # Get balancing reserves for the test date
-    br_query = f"""
-    SELECT * FROM balancing_reserves 
-    WHERE date = '{test_date}' 
-    ORDER BY timestamp DESC 
+    br_query = text("""
+    SELECT datetime_utc, reserve_type, amount_mw, price_eur
+    FROM balancing_reserves 
+    WHERE datetime_utc >= :start AND datetime_utc < :end
+    ORDER BY datetime_utc DESC 
+    LIMIT 5
+    """)
+    
+    # Get day-ahead prices for the test date
+    dap_query = text("""
+    SELECT datetime_utc, price_eur_per_mwh
+    FROM day_ahead_prices 
+    WHERE datetime_utc >= :start AND datetime_utc < :end
+    ORDER BY datetime_utc DESC 
     LIMIT 5
-    """
+    """)
+    
+    with pipeline.loader.acquire() as conn:
+        conn = conn.execution_options(stream_results=True)
+        br_data = pd.read_sql(br_query, conn, params=params)
+        dap_data = pd.read_sql(dap_query, conn, params=params)
     
-    br_data = pd.read_sql(br_query, pipeline.loader.connection)
     print(f"Balancing reserves for {test_date}: {len(br_data)} records")
     if not br_data.empty:
         print(br_data.head())
     
-    # Get day-ahead prices for the test date
-    dap_query = f"""
-    SELECT * FROM day_ahead_prices 
-    WHERE date = '{test_date}' 
-    ORDER BY timestamp DESC 
-    LIMIT 5
-    """
-    
-    dap_data = pd.read_sql(dap_query, pipeline.loader.connection)
     print(f"\nDay-ahead prices for {test_date}: {len(dap_data)} records")
     if not dap_data.empty:
         print(dap_data.head())
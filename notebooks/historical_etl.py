@@ -20,7 +20,7 @@
 
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Add the repository path to Python path
 repo_path = "/Workspace/Repos/your-repo-name"  # Update with your actual repo path
@@ -98,28 +98,24 @@ print("PRE-ETL DATABASE CHECK")
 print("=" * 60)
 
 try:
-    # Check existing data
+    # Check existing data: counts and date range come back in one query.
+    # Row counts are planner estimates (no table scan); set EXACT_COUNTS to
+    # count every row instead
     import pandas as pd
+    from sqlalchemy import text
     
-    # Count existing records
-    br_count_query = "SELECT COUNT(*) as count FROM balancing_reserves"
-    dap_count_query = "SELECT COUNT(*) as count FROM day_ahead_prices"
+    EXACT_COUNTS = False
+    stats = pipeline.loader.get_table_stats(estimate=not EXACT_COUNTS)
+    br_stats = stats.get('balancing_reserves', {})
+    dap_stats = stats.get('day_ahead_prices', {})
     
-    br_count = pd.read_sql(br_count_query, pipeline.loader.connection).iloc[0]['count']
-    dap_count = pd.read_sql(dap_count_query, pipeline.loader.connection).iloc[0]['count']
-    
-    print(f"Existing balancing reserves: {br_count} records")
-    print(f"Existing day-ahead prices: {dap_count} records")
+    approx = '' if EXACT_COUNTS else '~'
+    print(f"Existing balancing reserves: {approx}{br_stats.get('total_records')} records")
+    print(f"Existing day-ahead prices: {approx}{dap_stats.get('total_records')} records")
     
     # Check date range of existing data
-    br_date_query = """
-    SELECT MIN(date) as min_date, MAX(date) as max_date 
-    FROM balancing_reserves
-    """
-    
-    br_dates = pd.read_sql(br_date_query, pipeline.loader.connection)
-    if not br_dates.empty and br_dates.iloc[0]['min_date']:
-        print(f"BR date range: {br_dates.iloc[0]['min_date']} to {br_dates.iloc[0]['max_date']}")
+    if br_stats.get('earliest_date'):
+        print(f"BR date range: {br_stats['earliest_date']} to {br_stats['latest_date']}")
     
 except Exception as e:
     print(f"✗ Pre-ETL check failed: {e}")
@@ -138,11 +134,26 @@ print("=" * 60)
 start_time = datetime.now()
 print(f"ETL started at: {start_time}")
 
+# Set to True to backfill every configured country in parallel worker
+# processes instead of only the pipeline's country
+RUN_ALL_COUNTRIES = False
+
 try:
-    success = pipeline.run_historical_etl(
-        start_date=start_date.strftime('%Y-%m-%d'),
-        end_date=end_date.strftime('%Y-%m-%d')
-    )
+    if RUN_ALL_COUNTRIES:
+        from main import run_historical_etl_all_countries
+        
+        results = run_historical_etl_all_countries(
+            start_date=start_date.strftime('%Y-%m-%d'),
+            end_date=end_date.strftime('%Y-%m-%d')
+        )
+        for country, country_success in sorted(results.items()):
+            print(f"  - {country}: {'✓' if country_success else '✗'}")
+        success = all(results.values())
+    else:
+        success = pipeline.run_historical_etl(
+            start_date=start_date.strftime('%Y-%m-%d'),
+            end_date=end_date.strftime('%Y-%m-%d')
+        )
     
     end_time = datetime.now()
     duration = end_time - start_time
@@ -177,48 +188,48 @@ print("POST-ETL DATA VALIDATION")
 print("=" * 60)
 
 try:
-    # Check new data in the date range
-    br_new_query = f"""
-    SELECT COUNT(*) as count 
-    FROM balancing_reserves 
-    WHERE date >= '{start_date.strftime('%Y-%m-%d')}' 
-    AND date <= '{end_date.strftime('%Y-%m-%d')}'
-    """
-    
-    dap_new_query = f"""
-    SELECT COUNT(*) as count 
-    FROM day_ahead_prices 
-    WHERE date >= '{start_date.strftime('%Y-%m-%d')}' 
-    AND date <= '{end_date.strftime('%Y-%m-%d')}'
-    """
+    # Count new data in the date range for both tables in one round-trip
+    range_params = {
+        'start': f"{start_date.strftime('%Y-%m-%d')} 00:00:00+00",
+        'end': f"{(end_date + timedelta(days=1)).strftime('%Y-%m-%d')} 00:00:00+00"
+    }
+    new_count_query = text("""
+    SELECT 
+        (SELECT COUNT(*) FROM balancing_reserves 
+         WHERE datetime_utc >= :start AND datetime_utc < :end) as br_count,
+        (SELECT COUNT(*) FROM day_ahead_prices 
+         WHERE datetime_utc >= :start AND datetime_utc < :end) as dap_count
+    """)
     
-    br_new_count = pd.read_sql(br_new_query, pipeline.loader.connection).iloc[0]['count']
-    dap_new_count = pd.read_sql(dap_new_query, pipeline.loader.connection).iloc[0]['count']
+    with pipeline.loader.acquire() as conn:
+        br_new_count, dap_new_count = conn.execute(new_count_query, range_params).one()
     
     print(f"New balancing reserves in range: {br_new_count} records")
     print(f"New day-ahead prices in range: {dap_new_count} records")
     
-    # Show sample data
+    # Show sample data; the date range is bound, not interpolated
     if br_new_count > 0:
-        br_sample_query = f"""
-        SELECT * FROM balancing_reserves 
-        WHERE date >= '{start_date.strftime('%Y-%m-%d')}' 
-        AND date <= '{end_date.strftime('%Y-%m-%d')}'
-        ORDER BY timestamp DESC 
+        br_sample_query = text("""
+        SELECT datetime_utc, reserve_type, amount_mw, price_eur
+        FROM balancing_reserves 
+        WHERE datetime_utc >= :start AND datetime_utc < :end
+        ORDER BY datetime_utc DESC 
         LIMIT 3
-        """
-        br_sample = pd.read_sql(br_sample_query, pipeline.loader.connection)
+        """)
+        with pipeline.loader.acquire() as conn:
+            br_sample = pd.read_sql(br_sample_query, conn, params=range_params)
         print(f"\nSample BR data:\n{br_sample}")
     
     if dap_new_count > 0:
-        dap_sample_query = f"""
-        SELECT * FROM day_ahead_prices 
-        WHERE date >= '{start_date.strftime('%Y-%m-%d')}' 
-        AND date <= '{end_date.strftime('%Y-%m-%d')}'
-        ORDER BY timestamp DESC 
+        dap_sample_query = text("""
+        SELECT datetime_utc, price_eur_per_mwh
+        FROM day_ahead_prices 
+        WHERE datetime_utc >= :start AND datetime_utc < :end
+        ORDER BY datetime_utc DESC 
         LIMIT 3
-        """
-        dap_sample = pd.read_sql(dap_sample_query, pipeline.loader.connection)
+        """)
+        with pipeline.loader.acquire() as conn:
+            dap_sample = pd.read_sql(dap_sample_query, conn, params=range_params)
         print(f"\nSample DAP data:\n{dap_sample}")
         
 except Exception as e:
@@ -236,32 +247,49 @@ print("DATA QUALITY ANALYSIS")
 print("=" * 60)
 
 try:
-    # Check for missing data
-    missing_dates_query = f"""
-    WITH date_series AS (
-        SELECT generate_series(
-            '{start_date.strftime('%Y-%m-%d')}'::date,
-            '{end_date.strftime('%Y-%m-%d')}'::date,
-            '1 day'::interval
-        )::date as date
-    )
-    SELECT ds.date, 
-           CASE WHEN br.date IS NULL THEN 'Missing' ELSE 'Present' END as br_status,
-           CASE WHEN dap.date IS NULL THEN 'Missing' ELSE 'Present' END as dap_status
-    FROM date_series ds
-    LEFT JOIN (SELECT DISTINCT date FROM balancing_reserves) br ON ds.date = br.date
-    LEFT JOIN (SELECT DISTINCT date FROM day_ahead_prices) dap ON ds.date = dap.date
-    ORDER BY ds.date
-    """
+    # Check for missing data: expected days are generated here, and each
+    # table is asked only which of them have rows, one EXISTS probe per UTC
+    # day served by the datetime_utc index
+    expected_days = [
+        (start_date + timedelta(days=i)).date()
+        for i in range((end_date - start_date).days + 1)
+    ]
+    day_starts = [
+        datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        for day in expected_days
+    ]
+    
+    present_days = {}
+    with pipeline.loader.acquire() as conn:
+        for table in ('balancing_reserves', 'day_ahead_prices'):
+            present_days_query = text(f"""
+            SELECT day_start
+            FROM unnest(CAST(:day_starts AS timestamptz[])) AS day_start
+            WHERE EXISTS (
+                SELECT 1 FROM {table}
+                WHERE datetime_utc >= day_start
+                  AND datetime_utc < day_start + interval '1 day'
+            )
+            """)
+            present_days[table] = {
+                row[0].astimezone(timezone.utc).date()
+                for row in conn.execute(present_days_query, {'day_starts': day_starts})
+            }
     
-    missing_data = pd.read_sql(missing_dates_query, pipeline.loader.connection)
+    missing_br_days = set(expected_days) - present_days['balancing_reserves']
+    missing_dap_days = set(expected_days) - present_days['day_ahead_prices']
+    missing_data = pd.DataFrame({
+        'date': expected_days,
+        'br_status': ['Missing' if day in missing_br_days else 'Present' for day in expected_days],
+        'dap_status': ['Missing' if day in missing_dap_days else 'Present' for day in expected_days]
+    })
     
     print("Data availability by date:")
     print(missing_data)
     
     # Summary
-    missing_br = len(missing_data[missing_data['br_status'] == 'Missing'])
-    missing_dap = len(missing_data[missing_data['dap_status'] == 'Missing'])
+    missing_br = len(missing_br_days)
+    missing_dap = len(missing_dap_days)
     
     print(f"\nSummary:")
     print(f"  - Missing BR data: {missing_br} days")
@@ -1,44 +1,46 @@
 -- ENTSOE ETL Pipeline - PostgreSQL Schema
 -- Target: Supabase PostgreSQL database
 
+-- Tables are partitioned by month on datetime_utc, matching
+-- PostgresWriter.create_tables; the loader creates each monthly partition
+-- (e.g. balancing_reserves_y2024m01) before writing into it. Keys must
+-- include the partition column.
+
 -- Table 1: Balancing Reserves
 CREATE TABLE IF NOT EXISTS balancing_reserves (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     country_code VARCHAR(10) NOT NULL,
     datetime_utc TIMESTAMP WITH TIME ZONE NOT NULL,
     reserve_type TEXT NOT NULL,
-    amount_mw FLOAT,
-    price_eur FLOAT,
-    inserted_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    amount_mw DOUBLE PRECISION,
+    price_eur DOUBLE PRECISION,
+    inserted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, datetime_utc),
     UNIQUE(country_code, datetime_utc, reserve_type)
-);
+) PARTITION BY RANGE (datetime_utc);
 
 -- Table 2: Day Ahead Prices
 CREATE TABLE IF NOT EXISTS day_ahead_prices (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     country_code VARCHAR(10) NOT NULL,
     datetime_utc TIMESTAMP WITH TIME ZONE NOT NULL,
-    price_eur_per_mwh FLOAT NOT NULL,
-    inserted_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    price_eur_per_mwh DOUBLE PRECISION NOT NULL,
+    inserted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, datetime_utc),
     UNIQUE(country_code, datetime_utc)
-);
+) PARTITION BY RANGE (datetime_utc);
 
--- Create indexes for better performance
+-- Create indexes for better performance. Lookups by country_code use the
+-- leading column of each table's UNIQUE index, so it gets no index of its own
 CREATE INDEX IF NOT EXISTS idx_balancing_reserves_datetime 
 ON balancing_reserves(datetime_utc);
 
-CREATE INDEX IF NOT EXISTS idx_balancing_reserves_country 
-ON balancing_reserves(country_code);
-
 CREATE INDEX IF NOT EXISTS idx_balancing_reserves_type 
 ON balancing_reserves(reserve_type);
 
 CREATE INDEX IF NOT EXISTS idx_day_ahead_prices_datetime 
 ON day_ahead_prices(datetime_utc);
 
-CREATE INDEX IF NOT EXISTS idx_day_ahead_prices_country 
-ON day_ahead_prices(country_code);
-
 -- Comments for documentation
 COMMENT ON TABLE balancing_reserves IS 'Balancing reserves data from ENTSOE API';
 COMMENT ON TABLE day_ahead_prices IS 'Day-ahead electricity prices from ENTSOE API';
@@ -6,14 +6,18 @@ Databricks-friendly configuration handling.
 
 import os
 import json
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
-from pydantic import validator
+from pydantic import model_validator, validator
 
-# Load environment variables from .env file (only if it exists)
-if os.path.exists('.env'):
-    load_dotenv()
+
+@lru_cache(maxsize=None)
+def _load_env() -> None:
+    """Load environment variables from .env file (only if it exists), once per process."""
+    if os.path.exists('.env'):
+        load_dotenv()
 
 
 class Settings(BaseSettings):
@@ -38,6 +42,9 @@ class Settings(BaseSettings):
     max_retries: int = 3
     retry_delay: int = 5
     request_timeout: int = 30
+    max_concurrent_requests: int = 8  # Cap on API calls in flight across all fetches
+    api_cache_path: Optional[str] = None  # On-disk response cache (requires requests-cache)
+    api_cache_days: int = 30
     
     # Databricks-specific configuration
     is_databricks: bool = False
@@ -46,6 +53,9 @@ class Settings(BaseSettings):
     
     # ETL Configuration
     batch_size_days: int = 7  # Process data in 1-week chunks
+    etl_parallelism: int = 4  # Dates transformed concurrently in historical runs
+    db_pool_size: int = 8  # Pooled database connections shared by ETL workers
+    country_parallelism: int = 4  # Countries processed in parallel worker processes
     default_start_date: str = "2024-01-01"
     
     @validator('entsoe_api_key')
@@ -67,7 +77,9 @@ class Settings(BaseSettings):
             raise ValueError(f'Log level must be one of: {valid_levels}')
         return v.upper()
     
-    def __init__(self, **kwargs):
+    @model_validator(mode='before')
+    @classmethod
+    def detect_databricks(cls, values: Dict[str, Any]) -> Dict[str, Any]:
         # Check if running in Databricks environment
         databricks_env = any([
             'DATABRICKS_RUNTIME_VERSION' in os.environ,
@@ -76,20 +88,24 @@ class Settings(BaseSettings):
         ])
         
         if databricks_env:
-            kwargs['is_databricks'] = True
-            kwargs['databricks_workspace_url'] = os.environ.get('DATABRICKS_WORKSPACE_URL')
-            kwargs['databricks_cluster_id'] = os.environ.get('DATABRICKS_CLUSTER_ID')
+            values['is_databricks'] = True
+            values['databricks_workspace_url'] = os.environ.get('DATABRICKS_WORKSPACE_URL')
+            values['databricks_cluster_id'] = os.environ.get('DATABRICKS_CLUSTER_ID')
         
-        super().__init__(**kwargs)
+        return values
     
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 
+@lru_cache(maxsize=None)
 def load_country_config() -> Dict[str, Any]:
     """
     Load country configuration from JSON file.
+    The file is read once per process; the returned dictionary is shared,
+    so callers must not modify it. Use load_country_config.cache_clear()
+    to force a reload.
     
     Returns:
         Dictionary with country configurations
@@ -156,17 +172,40 @@ def get_api_endpoints() -> Dict[str, str]:
 def get_databricks_info() -> Dict[str, Any]:
     """
     Get Databricks environment information.
+    The environment is read once per process, like the settings.
     
     Returns:
         Dictionary with Databricks info
     """
+    return dict(_read_databricks_info())
+
+
+@lru_cache(maxsize=1)
+def _read_databricks_info() -> Dict[str, Any]:
+    """Read the Databricks environment variables once."""
     return {
         'workspace_url': os.environ.get('DATABRICKS_WORKSPACE_URL'),
         'cluster_id': os.environ.get('DATABRICKS_CLUSTER_ID'),
         'runtime_version': os.environ.get('DATABRICKS_RUNTIME_VERSION'),
-        'is_databricks': settings.is_databricks
+        'is_databricks': get_settings().is_databricks
     }
 
 
-# Global settings instance
-settings = Settings() 
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings instance.
+    Settings are built and validated on first call only.
+    
+    Returns:
+        Settings instance
+    """
+    _load_env()
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `from config import settings` working for notebooks and scripts
+    if name == 'settings':
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,26 +4,105 @@ Handles balancing reserves and day-ahead prices for multiple countries.
 Updated for new schema with reserve_type and amount_mw columns.
 """
 
+from __future__ import annotations
+
+import io
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
+from types import MappingProxyType
 import requests
-import xmltodict
-import pandas as pd
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
-from tenacity import retry, stop_after_attempt, wait_exponential
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple, Union, BinaryIO
+
+# pandas, numpy and lxml are imported where used to keep module import cheap
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+try:
+    from ciso8601 import parse_datetime as parse_iso_datetime
+except ImportError:  # Optional C parser; fall back to the standard library
+    parse_iso_datetime = datetime.fromisoformat
+
+try:
+    import requests_cache
+except ImportError:  # Optional on-disk response cache
+    requests_cache = None
+
+from config import get_settings, get_country_info, get_api_endpoints
+from utils import safe_float_array
+
+logger = logging.getLogger("entsoe_etl.entsoe_api")
+
+_ONE_DAY = timedelta(days=1)
+
+# Longest window the API serves in one day-ahead prices (A44) request
+_DAY_AHEAD_PRICES_MAX_DAYS = 365
+
+# Map business types to reserve types (read-only, shared by every parse)
+_RESERVE_TYPE_MAPPING = MappingProxyType({
+    'A95': 'Primary Reserve',
+    'A96': 'Secondary Reserve',
+    'A97': 'Tertiary Reserve',
+    'A98': 'Manual Frequency Restoration Reserve',
+    'A99': 'Automatic Frequency Restoration Reserve'
+})
 
-from config import settings, get_country_info, get_api_endpoints
-from utils import retry_function, safe_float
+# Column schemas of the parsed frames
+_BALANCING_RESERVES_DTYPES = {
+    'country_code': 'category',
+    'datetime_utc': 'datetime64[ns, UTC]',
+    'reserve_type': 'category',
+    'amount_mw': 'float64',
+    'price_eur': 'float64'
+}
+
+_DAY_AHEAD_PRICES_DTYPES = {
+    'country_code': 'category',
+    'datetime_utc': 'datetime64[ns, UTC]',
+    'price_eur_per_mwh': 'float64'
+}
+
+
+def _empty_frame(dtypes: Dict[str, str]) -> pd.DataFrame:
+    # Empty results keep the typed schema, so no dtype inference happens downstream
+    import pandas as pd
+    
+    return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in dtypes.items()})
+
+
+def _as_list(value: Any) -> List[Any]:
+    # A single child comes back as one item rather than a list of one
+    return value if isinstance(value, list) else [] if value is None else [value]
+
+
+def _point_column(point_lists: List[List[Dict[str, Any]]], key: str, total: int) -> np.ndarray:
+    # One preallocated array per column, filled series after series in C
+    import numpy as np
+    
+    values = chain.from_iterable(map(dict.get, points, repeat(key)) for points in point_lists)
+    return np.fromiter(values, dtype=object, count=total)
 
 
 class ENTSOEAPIClient:
     """Client for interacting with ENTSOE Transparency Platform API."""
     
+    __slots__ = (
+        'api_key', 'base_url', 'timeout', 'max_workers',
+        'country_info', 'country_code', 'country_eic', 'timezone_str',
+        'api_endpoints', 'session', 'cache_enabled', 'executor'
+    )
+    
     def __init__(self, country_code: str = None):
+        settings = get_settings()
         self.api_key = settings.entsoe_api_key
         self.base_url = settings.entsoe_base_url
         self.timeout = settings.request_timeout
-        self.logger = logging.getLogger("entsoe_etl.entsoe_api")
+        self.max_workers = settings.max_concurrent_requests
         
         # Set country configuration
         self.country_info = get_country_info(country_code)
@@ -33,6 +112,46 @@ class ENTSOEAPIClient:
         
         # Get API endpoints
         self.api_endpoints = get_api_endpoints()
+        
+        # Pooled HTTP session so keep-alive connections are reused across requests,
+        # optionally backed by an on-disk cache so reruns skip the network
+        self.cache_enabled = bool(settings.api_cache_path) and requests_cache is not None
+        if self.cache_enabled:
+            self.session = requests_cache.CachedSession(
+                cache_name=settings.api_cache_path,
+                backend='sqlite',
+                expire_after=timedelta(days=settings.api_cache_days),
+                # The key is never part of the cache key nor stored with the response
+                ignored_parameters=['securityToken'],
+                filter_fn=self._is_cacheable
+            )
+        else:
+            if settings.api_cache_path:
+                logger.warning("API_CACHE_PATH is set but requests-cache is not installed; caching disabled")
+            self.session = requests.Session()
+        self.session.headers.update(settings.entsoe_headers)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=settings.max_concurrent_requests,
+            max_retries=Retry(
+                total=settings.max_retries,
+                backoff_factor=settings.retry_delay,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods={'GET'},
+                respect_retry_after_header=True
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # One request pool for every concurrent fetch, sized like the HTTP
+        # connection pool, so callers running in their own threads share
+        # a single bound on in-flight requests
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='entsoe-api'
+        )
     
     def _make_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -51,28 +170,115 @@ class ENTSOEAPIClient:
             # Add API key to parameters
             params['securityToken'] = self.api_key
             
-            self.logger.debug(f"Making API request with params: {params}")
+            logger.debug("Making API request with params: %s", params)
             
-            response = retry_function(
-                requests.get,
+            response = self.session.get(
                 self.base_url,
                 params=params,
-                timeout=self.timeout
+                timeout=self.timeout,
+                stream=True
             )
             
-            response.raise_for_status()
-            
-            # Parse XML response
-            data = xmltodict.parse(response.content)
-            return data
+            try:
+                response.raise_for_status()
+                
+                # Parse XML response while it is received, decompressing on the fly
+                response.raw.decode_content = True
+                return self._parse_response(response.raw)
+            finally:
+                response.close()
             
         except requests.RequestException as e:
-            self.logger.error(f"API request failed: {e}")
+            logger.error("API request failed: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error during API request: {e}")
+            logger.error("Unexpected error during API request: %s", e)
             raise
     
+    @staticmethod
+    def _is_cacheable(response: requests.Response) -> bool:
+        """
+        Decide whether a response may be stored in the on-disk cache.
+        Periods ending within the last day may still be revised, so they are
+        never stored and are always fetched fresh.
+        
+        Args:
+            response: API response
+        
+        Returns:
+            True if the response covers a settled period
+        """
+        period_end = parse_qs(urlsplit(response.url).query).get('periodEnd')
+        if not period_end:
+            return False
+        period_end = datetime.strptime(period_end[0], '%Y%m%d%H%M').replace(tzinfo=timezone.utc)
+        return period_end <= datetime.now(timezone.utc) - _ONE_DAY
+    
+    def close_session(self):
+        """Close HTTP session and the request pool."""
+        self.executor.shutdown(wait=True)
+        self.session.close()
+        logger.debug("API session closed")
+    
+    @staticmethod
+    def _parse_response(content: Union[bytes, BinaryIO]) -> Dict[str, Any]:
+        """
+        Parse API response XML, streaming the TimeSeries elements.
+        Each TimeSeries is cleared once converted, so memory stays flat
+        however many series the document holds.
+        
+        Args:
+            content: Raw XML response body or file-like stream
+        
+        Returns:
+            Dictionary of the form {root_tag: {'TimeSeries': [...]}}
+        """
+        from lxml import etree
+        
+        if isinstance(content, bytes):
+            content = io.BytesIO(content)
+        
+        time_series = []
+        context = etree.iterparse(content, events=('end',), tag='{*}TimeSeries')
+        for _, elem in context:
+            time_series.extend(ENTSOEAPIClient._ts_to_dicts(elem))
+            # Drop the parsed subtree and any siblings already handled
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        
+        if context.root is None:
+            return {}
+        return {etree.QName(context.root).localname: {'TimeSeries': time_series}}
+    
+    @staticmethod
+    def _ts_to_dicts(elem) -> List[Dict[str, Any]]:
+        """
+        Convert a TimeSeries element into the dictionaries the parsers consume.
+        A series with several Periods yields one dictionary per Period.
+        
+        Args:
+            elem: TimeSeries element
+        
+        Returns:
+            List of time series dictionaries
+        """
+        business_type = elem.findtext('{*}businessType')
+        series = []
+        for period in elem.iterfind('{*}Period'):
+            series.append({
+                'businessType': business_type,
+                'Period': {
+                    'timeInterval': {'start': period.findtext('{*}timeInterval/{*}start')},
+                    # Point children keyed by local name, e.g. position, quantity, price.amount
+                    'Point': [
+                        {child.tag.rpartition('}')[2]: child.text for child in point}
+                        for point in period.iterfind('{*}Point')
+                    ]
+                }
+            })
+        return series
+    
     def get_balancing_reserves(self, date: datetime) -> pd.DataFrame:
         """
         Fetch balancing reserves data for a specific date.
@@ -84,18 +290,18 @@ class ENTSOEAPIClient:
         Returns:
             DataFrame with balancing reserves data
         """
-        self.logger.info(f"Fetching balancing reserves for {self.country_code} on {date.strftime('%Y-%m-%d')}")
+        import pandas as pd
         
-        # Format date for API
-        start_date = date.strftime('%Y%m%d0000')
-        end_date = (date + pd.Timedelta(days=1)).strftime('%Y%m%d0000')
+        day = f'{date:%Y-%m-%d}'
+        logger.info("Fetching balancing reserves for %s on %s", self.country_code, day)
         
         params = {
             'documentType': 'A73',  # Balancing reserves
             'in_Domain': self.country_eic,
             'out_Domain': self.country_eic,
-            'periodStart': start_date,
-            'periodEnd': end_date
+            # Format date for API
+            'periodStart': f'{date:%Y%m%d}0000',
+            'periodEnd': f'{date + _ONE_DAY:%Y%m%d}0000'
         }
         
         try:
@@ -105,22 +311,23 @@ class ENTSOEAPIClient:
             time_series = self._extract_time_series(data, 'balancing_reserves')
             
             if not time_series:
-                self.logger.warning(f"No balancing reserves data found for {self.country_code} on {date.strftime('%Y-%m-%d')}")
-                return pd.DataFrame()
+                logger.warning("No balancing reserves data found for %s on %s", self.country_code, day)
+                return _empty_frame(_BALANCING_RESERVES_DTYPES)
             
             # Convert to DataFrame
             df = self._parse_balancing_reserves(time_series, date)
             
-            self.logger.info(f"Retrieved {len(df)} balancing reserves records for {self.country_code}")
+            logger.info("Retrieved %s balancing reserves records for %s", len(df), self.country_code)
             return df
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch balancing reserves for {self.country_code}: {e}")
+            logger.error("Failed to fetch balancing reserves for %s: %s", self.country_code, e)
             raise
     
     def get_day_ahead_prices(self, date: datetime) -> pd.DataFrame:
         """
         Fetch day-ahead prices data for a specific date.
+        Prefer get_day_ahead_prices_range for several consecutive dates.
         
         Args:
             date: Date to fetch data for (datetime object)
@@ -128,18 +335,58 @@ class ENTSOEAPIClient:
         Returns:
             DataFrame with day-ahead prices data
         """
-        self.logger.info(f"Fetching day-ahead prices for {self.country_code} on {date.strftime('%Y-%m-%d')}")
+        return self.get_day_ahead_prices_range(date, date)
+    
+    def get_day_ahead_prices_range(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Fetch day-ahead prices data for a date range with as few requests as possible.
+        Each request covers up to a year, the most the API serves at once.
+        
+        Args:
+            start: First date to fetch (datetime object)
+            end: Last date to fetch, inclusive (datetime object)
         
-        # Format date for API
-        start_date = date.strftime('%Y%m%d0000')
-        end_date = (date + pd.Timedelta(days=1)).strftime('%Y%m%d0000')
+        Returns:
+            DataFrame with day-ahead prices data for the whole range
+        """
+        import pandas as pd
+        
+        frames = []
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=_DAY_AHEAD_PRICES_MAX_DAYS - 1), end)
+            df = self._fetch_day_ahead_prices(chunk_start, chunk_end)
+            if not df.empty:
+                frames.append(df)
+            chunk_start = chunk_end + _ONE_DAY
+        
+        if not frames:
+            return _empty_frame(_DAY_AHEAD_PRICES_DTYPES)
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+    
+    def _fetch_day_ahead_prices(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Fetch day-ahead prices data for a date range in a single request.
+        
+        Args:
+            start: First date to fetch (datetime object)
+            end: Last date to fetch, inclusive (datetime object)
+        
+        Returns:
+            DataFrame with day-ahead prices data
+        """
+        period = f'{start:%Y-%m-%d}' if start == end else f'{start:%Y-%m-%d} to {end:%Y-%m-%d}'
+        logger.info("Fetching day-ahead prices for %s on %s", self.country_code, period)
         
         params = {
             'documentType': 'A44',  # Day-ahead prices
             'in_Domain': self.country_eic,
             'out_Domain': self.country_eic,
-            'periodStart': start_date,
-            'periodEnd': end_date
+            # Format dates for API
+            'periodStart': f'{start:%Y%m%d}0000',
+            'periodEnd': f'{end + _ONE_DAY:%Y%m%d}0000'
         }
         
         try:
@@ -149,19 +396,82 @@ class ENTSOEAPIClient:
             time_series = self._extract_time_series(data, 'day_ahead_prices')
             
             if not time_series:
-                self.logger.warning(f"No day-ahead prices data found for {self.country_code} on {date.strftime('%Y-%m-%d')}")
-                return pd.DataFrame()
+                logger.warning("No day-ahead prices data found for %s on %s", self.country_code, period)
+                return _empty_frame(_DAY_AHEAD_PRICES_DTYPES)
             
-            # Convert to DataFrame
-            df = self._parse_day_ahead_prices(time_series, date)
+            # Convert to DataFrame; every point is timed from its own series' period start
+            df = self._parse_day_ahead_prices(time_series, start)
             
-            self.logger.info(f"Retrieved {len(df)} day-ahead prices records for {self.country_code}")
+            logger.info("Retrieved %s day-ahead prices records for %s", len(df), self.country_code)
             return df
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch day-ahead prices for {self.country_code}: {e}")
+            logger.error("Failed to fetch day-ahead prices for %s: %s", self.country_code, e)
             raise
     
+    def get_day(self, date: datetime) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Fetch balancing reserves and day-ahead prices for a date concurrently.
+        
+        Args:
+            date: Date to fetch data for (datetime object)
+        
+        Returns:
+            Tuple of (balancing reserves DataFrame, day-ahead prices DataFrame)
+        """
+        reserves = self.executor.submit(self.get_balancing_reserves, date)
+        prices = self.executor.submit(self.get_day_ahead_prices, date)
+        return reserves.result(), prices.result()
+    
+    def get_balancing_reserves_batch(self, dates: List[datetime]) -> pd.DataFrame:
+        """
+        Fetch balancing reserves data for several dates concurrently.
+        
+        Args:
+            dates: Dates to fetch data for (datetime objects)
+        
+        Returns:
+            DataFrame with balancing reserves data for all dates
+        """
+        return self._fetch_batch(self.get_balancing_reserves, dates, _BALANCING_RESERVES_DTYPES)
+    
+    def get_day_ahead_prices_batch(self, dates: List[datetime]) -> pd.DataFrame:
+        """
+        Fetch day-ahead prices data for several dates concurrently.
+        
+        Args:
+            dates: Dates to fetch data for (datetime objects)
+        
+        Returns:
+            DataFrame with day-ahead prices data for all dates
+        """
+        return self._fetch_batch(self.get_day_ahead_prices, dates, _DAY_AHEAD_PRICES_DTYPES)
+    
+    def _fetch_batch(self, fetch, dates: List[datetime], dtypes: Dict[str, str]) -> pd.DataFrame:
+        """
+        Run a single-date fetch method over several dates in the request pool.
+        API calls are I/O-bound, so requests overlap instead of running back to back.
+        
+        Args:
+            fetch: Single-date fetch method
+            dates: Dates to fetch data for
+            dtypes: Column dtypes of the empty frame returned when there is no data
+        
+        Returns:
+            Concatenated DataFrame of all non-empty results
+        """
+        import pandas as pd
+        
+        if not dates:
+            return _empty_frame(dtypes)
+        
+        frames = [df for df in self.executor.map(fetch, dates) if not df.empty]
+        
+        if not frames:
+            return _empty_frame(dtypes)
+        
+        return pd.concat(frames, ignore_index=True)
+    
     def _extract_time_series(self, data: Dict[str, Any], data_type: str) -> List[Dict[str, Any]]:
         """
         Extract time series data from API response.
@@ -176,17 +486,13 @@ class ENTSOEAPIClient:
         try:
             # Navigate through the XML structure
             publication_market_document = data.get('Publication_MarketDocument', {})
-            time_series = publication_market_document.get('TimeSeries', [])
+            time_series = _as_list(publication_market_document.get('TimeSeries'))
             
-            # Ensure time_series is always a list
-            if not isinstance(time_series, list):
-                time_series = [time_series]
-            
-            self.logger.debug(f"Extracted {len(time_series)} time series for {data_type}")
+            logger.debug("Extracted %s time series for %s", len(time_series), data_type)
             return time_series
             
         except Exception as e:
-            self.logger.error(f"Failed to extract time series for {data_type}: {e}")
+            logger.error("Failed to extract time series for %s: %s", data_type, e)
             return []
     
     def _parse_balancing_reserves(self, time_series: List[Dict[str, Any]], date: datetime) -> pd.DataFrame:
@@ -201,50 +507,58 @@ class ENTSOEAPIClient:
         Returns:
             DataFrame with balancing reserves data
         """
-        records = []
+        import numpy as np
+        import pandas as pd
+        
+        # Points of every series are counted first, then copied into one
+        # preallocated array per column and converted in one pass
+        starts, counts, series_codes, point_lists = [], [], [], []
+        reserve_type_categories: Dict[str, int] = {}
         
         for series in time_series:
             try:
                 # Extract reserve type
                 business_type = series.get('businessType', '')
-                reserve_type = self._extract_reserve_type_from_business_type(business_type)
+                reserve_type = _RESERVE_TYPE_MAPPING.get(business_type, business_type)
                 
                 # Extract period data
                 period = series.get('Period', {})
-                points = period.get('Point', [])
+                points = _as_list(period.get('Point'))
                 
-                if not isinstance(points, list):
-                    points = [points]
+                period_start = period.get('timeInterval', {}).get('start', '')
+                if not period_start or not points:
+                    continue
                 
-                for point in points:
-                    try:
-                        position = int(point.get('position', 0))
-                        amount = safe_float(point.get('quantity'))
-                        price = safe_float(point.get('price.amount'))
-                        
-                        # Calculate datetime from position
-                        period_start = period.get('timeInterval', {}).get('start', '')
-                        if period_start:
-                            start_dt = datetime.fromisoformat(period_start.replace('Z', '+00:00'))
-                            dt = start_dt + pd.Timedelta(hours=position-1)
-                            
-                            records.append({
-                                'country_code': self.country_code,
-                                'datetime_utc': dt,
-                                'reserve_type': reserve_type,
-                                'amount_mw': amount,
-                                'price_eur': price
-                            })
-                    
-                    except (ValueError, KeyError) as e:
-                        self.logger.warning(f"Failed to parse balancing reserves point: {e}")
-                        continue
+                start = self._period_start_utc(period_start)
             
-            except Exception as e:
-                self.logger.warning(f"Failed to parse balancing reserves series: {e}")
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("Failed to parse balancing reserves series: %s", e)
                 continue
+            
+            starts.append(start)
+            counts.append(len(points))
+            series_codes.append(reserve_type_categories.setdefault(reserve_type, len(reserve_type_categories)))
+            point_lists.append(points)
+        
+        if not starts:
+            return _empty_frame(_BALANCING_RESERVES_DTYPES)
+        
+        total = sum(counts)
+        raw_amounts = _point_column(point_lists, 'quantity', total)
+        raw_prices = _point_column(point_lists, 'price.amount', total)
+        datetimes, valid = self._point_datetimes(starts, counts, _point_column(point_lists, 'position', total))
+        datetime_utc = pd.to_datetime(datetimes[valid], utc=True)
         
-        return pd.DataFrame(records)
+        return pd.DataFrame({
+            'country_code': self._country_code_column(len(datetime_utc)),
+            'datetime_utc': datetime_utc,
+            'reserve_type': pd.Categorical.from_codes(
+                np.repeat(np.array(series_codes, dtype=np.int16), counts)[valid],
+                categories=list(reserve_type_categories)
+            ),
+            'amount_mw': safe_float_array(raw_amounts)[valid],
+            'price_eur': safe_float_array(raw_prices)[valid]
+        })
     
     def _parse_day_ahead_prices(self, time_series: List[Dict[str, Any]], date: datetime) -> pd.DataFrame:
         """
@@ -257,43 +571,104 @@ class ENTSOEAPIClient:
         Returns:
             DataFrame with day-ahead prices data
         """
-        records = []
+        import numpy as np
+        import pandas as pd
+        
+        # Points of every series are counted first, then copied into one
+        # preallocated array per column and converted in one pass
+        starts, counts, point_lists = [], [], []
         
         for series in time_series:
             try:
                 # Extract period data
                 period = series.get('Period', {})
-                points = period.get('Point', [])
+                points = _as_list(period.get('Point'))
                 
-                if not isinstance(points, list):
-                    points = [points]
+                period_start = period.get('timeInterval', {}).get('start', '')
+                if not period_start or not points:
+                    continue
                 
-                for point in points:
-                    try:
-                        position = int(point.get('position', 0))
-                        price = safe_float(point.get('price.amount'))
-                        
-                        # Calculate datetime from position
-                        period_start = period.get('timeInterval', {}).get('start', '')
-                        if period_start:
-                            start_dt = datetime.fromisoformat(period_start.replace('Z', '+00:00'))
-                            dt = start_dt + pd.Timedelta(hours=position-1)
-                            
-                            records.append({
-                                'country_code': self.country_code,
-                                'datetime_utc': dt,
-                                'price_eur_per_mwh': price
-                            })
-                    
-                    except (ValueError, KeyError) as e:
-                        self.logger.warning(f"Failed to parse day-ahead price point: {e}")
-                        continue
+                start = self._period_start_utc(period_start)
             
-            except Exception as e:
-                self.logger.warning(f"Failed to parse day-ahead prices series: {e}")
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("Failed to parse day-ahead prices series: %s", e)
                 continue
+            
+            starts.append(start)
+            counts.append(len(points))
+            point_lists.append(points)
+        
+        if not starts:
+            return _empty_frame(_DAY_AHEAD_PRICES_DTYPES)
+        
+        total = sum(counts)
+        raw_prices = _point_column(point_lists, 'price.amount', total)
+        datetimes, valid = self._point_datetimes(starts, counts, _point_column(point_lists, 'position', total))
+        datetime_utc = pd.to_datetime(datetimes[valid], utc=True)
+        
+        return pd.DataFrame({
+            'country_code': self._country_code_column(len(datetime_utc)),
+            'datetime_utc': datetime_utc,
+            'price_eur_per_mwh': safe_float_array(raw_prices)[valid]
+        })
+    
+    def _country_code_column(self, length: int) -> pd.Categorical:
+        """
+        Build a dictionary-encoded country code column.
+        
+        Args:
+            length: Number of rows
+        
+        Returns:
+            Categorical with a single country code category
+        """
+        import numpy as np
+        import pandas as pd
+        
+        return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[self.country_code])
+    
+    @staticmethod
+    def _period_start_utc(period_start: str) -> np.datetime64:
+        """
+        Parse a period start into a naive UTC datetime64.
+        
+        Args:
+            period_start: Period start as ISO 8601 string
         
-        return pd.DataFrame(records)
+        Returns:
+            Naive UTC datetime64 value
+        """
+        import numpy as np
+        
+        if period_start.endswith('Z'):
+            # ENTSOE periods are UTC, so numpy can parse the string directly
+            return np.datetime64(period_start[:-1], 'ns')
+        start_dt = parse_iso_datetime(period_start)
+        return np.datetime64(start_dt.astimezone(timezone.utc).replace(tzinfo=None), 'ns')
+    
+    @staticmethod
+    def _point_datetimes(starts: List[np.datetime64], counts: List[int],
+                         raw_positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert 1-based hourly point positions of several series into UTC datetimes.
+        
+        Args:
+            starts: Period start of each series
+            counts: Number of points in each series
+            raw_positions: Position strings of all points, series after series
+        
+        Returns:
+            Tuple of (naive UTC datetime64 array, mask of points with a valid position)
+        """
+        import numpy as np
+        
+        positions = safe_float_array(raw_positions)
+        valid = ~np.isnan(positions)
+        if not valid.all():
+            logger.warning("Dropped %d points with invalid positions", int((~valid).sum()))
+        
+        offsets = (np.where(valid, positions, 1) - 1).astype(np.int64).astype('timedelta64[h]')
+        return np.repeat(np.array(starts, dtype='datetime64[ns]'), counts) + offsets, valid
     
     def _extract_reserve_type_from_business_type(self, business_type: str) -> str:
         """
@@ -306,13 +681,4 @@ class ENTSOEAPIClient:
         Returns:
             Reserve type string
         """
-        # Map business types to reserve types
-        reserve_type_mapping = {
-            'A95': 'Primary Reserve',
-            'A96': 'Secondary Reserve',
-            'A97': 'Tertiary Reserve',
-            'A98': 'Manual Frequency Restoration Reserve',
-            'A99': 'Automatic Frequency Restoration Reserve'
-        }
-        
-        return reserve_type_mapping.get(business_type, business_type) 
\ No newline at end of file
+        return _RESERVE_TYPE_MAPPING.get(business_type, business_type)
\ No newline at end of file
@@ -4,38 +4,190 @@ Handles PostgreSQL operations using psycopg2.
 Updated for new schema with reserve_type and amount_mw columns.
 """
 
+import io
 import logging
-import psycopg2
+import struct
+import threading
+from contextlib import contextmanager
+import numpy as np
 import pandas as pd
-from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
-from psycopg2.extras import RealDictCursor
+from datetime import datetime, timedelta, timezone
+from itertools import chain, repeat
+from typing import Optional, List, Dict, Any, Iterator, Union
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
+from psycopg2.errors import UniqueViolation
 
-from config import settings
-from utils import validate_dataframe
+from config import get_settings
+
+# Secondary indexes by name. Lookups by country_code are served by the
+# leading column of each table's UNIQUE(country_code, datetime_utc, ...)
+# index, so no separate country index is kept.
+_INDEXES = {
+    'idx_balancing_reserves_datetime': 'balancing_reserves(datetime_utc)',
+    'idx_balancing_reserves_type': 'balancing_reserves(reserve_type)',
+    'idx_day_ahead_prices_datetime': 'day_ahead_prices(datetime_utc)',
+}
+
+# Column name -> COPY BINARY wire type for each loaded table
+_BALANCING_RESERVES_COLUMNS = {
+    'country_code': 'text',
+    'datetime_utc': 'timestamptz',
+    'reserve_type': 'text',
+    'amount_mw': 'float8',
+    'price_eur': 'float8',
+}
+_DAY_AHEAD_PRICES_COLUMNS = {
+    'country_code': 'text',
+    'datetime_utc': 'timestamptz',
+    'price_eur_per_mwh': 'float8',
+}
+
+# Rows encoded per COPY chunk; bounds the buffer held in memory
+_COPY_CHUNK_ROWS = 10000
+
+# COPY BINARY framing: signature, flags and header extension length, and
+# the -1 field count that ends the stream
+_COPY_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+_COPY_BINARY_TRAILER = struct.pack('>h', -1)
+_NULL_FIELD = struct.pack('>i', -1)
+
+# Postgres timestamps count microseconds from 2000-01-01 UTC
+_PG_EPOCH_US = 946684800 * 1000000
+
+
+def _binary_fields(values: pd.Series, pg_type: str) -> np.ndarray:
+    """
+    Encode a column as COPY BINARY fields, one length-prefixed value per row.
+    
+    Args:
+        values: Column to encode
+        pg_type: Wire type: 'text', 'float8' or 'timestamptz'
+    
+    Returns:
+        Object array of bytes, with the NULL marker for missing values
+    """
+    if pg_type == 'text':
+        # Few distinct strings per column: encode each once, then look up
+        codes, uniques = pd.factorize(values)
+        encoded = [str(value).encode('utf-8') for value in uniques]
+        lookup = np.array(
+            [struct.pack('>i', len(value)) + value for value in encoded] + [_NULL_FIELD],
+            dtype=object
+        )
+        return lookup[codes]
+    
+    packed = np.empty(len(values), dtype=[('len', '>i4'), ('val', '>i8' if pg_type == 'timestamptz' else '>f8')])
+    packed['len'] = 8
+    if pg_type == 'timestamptz':
+        stamps = pd.to_datetime(values, utc=True)
+        missing = stamps.isna().to_numpy()
+        micros = np.asarray(stamps.dt.tz_localize(None), dtype='datetime64[us]').view(np.int64)
+        packed['val'] = np.where(missing, 0, micros - _PG_EPOCH_US)
+    elif pg_type == 'float8':
+        floats = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        missing = np.isnan(floats)
+        packed['val'] = floats
+    else:
+        raise ValueError(f"Unsupported COPY type: {pg_type}")
+    
+    fields = np.empty(len(values), dtype=object)
+    fields[:] = packed.view(f'V{packed.itemsize}').tolist()
+    fields[missing] = _NULL_FIELD
+    return fields
+
+
+class _ChunkReader(io.IOBase):
+    """Read-only stream over an iterator of str or bytes chunks."""
+    
+    def __init__(self, chunks: Iterator[Union[str, bytes]], empty: Union[str, bytes] = ''):
+        self._chunks = chunks
+        self._empty = empty
+        self._chunk = empty
+        self._pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def read(self, size: int = -1) -> Union[str, bytes]:
+        parts = []
+        remaining = size
+        while remaining != 0:
+            if self._pos >= len(self._chunk):
+                # An empty chunk is skipped; only exhaustion ends the stream
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    self._chunk = self._empty
+                    break
+                self._chunk = chunk
+                self._pos = 0
+                continue
+            end = len(self._chunk) if remaining < 0 else self._pos + remaining
+            part = self._chunk[self._pos:end]
+            self._pos += len(part)
+            parts.append(part)
+            if remaining > 0:
+                remaining -= len(part)
+        return self._empty.join(parts)
 
 
 class PostgresWriter:
     """Handles database operations for the ETL pipeline."""
     
     def __init__(self):
+        settings = get_settings()
         self.database_url = settings.database_url
+        self.pool_size = settings.db_pool_size
         self.logger = logging.getLogger("entsoe_etl.postgres_writer")
         self.engine = None
+        self._engine_lock = threading.Lock()
+        self._partitioned = {}  # table name -> whether it is range-partitioned
+        self._partitions = set()  # partitions known to exist
     
     def _get_engine(self):
         """Get SQLAlchemy engine for database operations."""
-        if self.engine is None:
-            try:
-                self.engine = create_engine(self.database_url)
-                self.logger.debug("Database engine created successfully")
-            except Exception as e:
-                self.logger.error(f"Failed to create database engine: {e}")
-                raise
+        # Writers may run on several threads; create the engine only once
+        with self._engine_lock:
+            if self.engine is None:
+                try:
+                    # COPY goes through psycopg2's copy_expert, so pin the driver
+                    url = make_url(self.database_url)
+                    if url.drivername == 'postgresql':
+                        url = url.set(drivername='postgresql+psycopg2')
+                    # Synchronous commit is relaxed per session: every row can be
+                    # re-fetched from ENTSO-E, so losing the last commits on a
+                    # server crash is acceptable for the faster COPY + merge
+                    self.engine = create_engine(
+                        url,
+                        pool_size=self.pool_size,
+                        max_overflow=0,
+                        pool_pre_ping=True,
+                        pool_recycle=1800,
+                        connect_args={
+                            'application_name': 'entsoe-etl',
+                            'options': '-c synchronous_commit=off'
+                        }
+                    )
+                    self.logger.debug("Database engine created successfully")
+                except Exception as e:
+                    self.logger.error(f"Failed to create database engine: {e}")
+                    raise
         return self.engine
     
+    @contextmanager
+    def acquire(self):
+        """
+        Borrow a pooled connection inside a transaction.
+        The transaction commits when the block exits normally and rolls back
+        on error; the connection then returns to the pool.
+        
+        Yields:
+            SQLAlchemy connection
+        """
+        with self._get_engine().begin() as conn:
+            yield conn
+    
     def test_connection(self) -> bool:
         """
         Test database connection.
@@ -53,6 +205,36 @@ class PostgresWriter:
             self.logger.error(f"Database connection test failed: {e}")
             return False
     
+    def _copy_df(self, conn, df: pd.DataFrame, table: str, columns: Dict[str, str]):
+        """
+        Bulk load DataFrame columns into a table with binary COPY FROM STDIN.
+        Rows are encoded straight from the column arrays, one chunk at a time
+        as COPY reads them, so the server parses no text and the encoded
+        stream is never held in memory whole.
+        
+        Args:
+            conn: SQLAlchemy connection whose transaction the COPY joins
+            df: DataFrame holding the rows to load
+            table: Target table name
+            columns: Column name to wire type, in table order
+        """
+        field_count = struct.pack('>h', len(columns))
+        
+        def chunks():
+            yield _COPY_BINARY_HEADER
+            for start in range(0, len(df), _COPY_CHUNK_ROWS):
+                part = df.iloc[start:start + _COPY_CHUNK_ROWS]
+                fields = [_binary_fields(part[name], pg_type) for name, pg_type in columns.items()]
+                yield b''.join(chain.from_iterable(zip(repeat(field_count), *fields)))
+            yield _COPY_BINARY_TRAILER
+        
+        with conn.connection.cursor() as cur:
+            cur.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT BINARY)",
+                _ChunkReader(chunks(), b''),
+                size=65536
+            )
+    
     def create_tables(self) -> bool:
         """
         Create database tables if they don't exist.
@@ -64,61 +246,81 @@ class PostgresWriter:
         try:
             engine = self._get_engine()
             
-            # SQL for creating tables with new schema
+            # SQL for creating tables with new schema, partitioned by month
+            # on datetime_utc; keys must include the partition column
             balancing_reserves_sql = """
             CREATE TABLE IF NOT EXISTS balancing_reserves (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 country_code VARCHAR(10) NOT NULL,
                 datetime_utc TIMESTAMP WITH TIME ZONE NOT NULL,
                 reserve_type TEXT NOT NULL,
-                amount_mw FLOAT,
-                price_eur FLOAT,
+                amount_mw DOUBLE PRECISION,
+                price_eur DOUBLE PRECISION,
                 inserted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (id, datetime_utc),
                 UNIQUE(country_code, datetime_utc, reserve_type)
-            );
+            ) PARTITION BY RANGE (datetime_utc);
             """
             
             day_ahead_prices_sql = """
             CREATE TABLE IF NOT EXISTS day_ahead_prices (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 country_code VARCHAR(10) NOT NULL,
                 datetime_utc TIMESTAMP WITH TIME ZONE NOT NULL,
-                price_eur_per_mwh FLOAT NOT NULL,
+                price_eur_per_mwh DOUBLE PRECISION NOT NULL,
                 inserted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (id, datetime_utc),
                 UNIQUE(country_code, datetime_utc)
-            );
+            ) PARTITION BY RANGE (datetime_utc);
             """
             
-            # Create indexes for better performance
-            balancing_reserves_indexes = """
-            CREATE INDEX IF NOT EXISTS idx_balancing_reserves_datetime 
-            ON balancing_reserves(datetime_utc);
-            
-            CREATE INDEX IF NOT EXISTS idx_balancing_reserves_country 
-            ON balancing_reserves(country_code);
-            
-            CREATE INDEX IF NOT EXISTS idx_balancing_reserves_type 
-            ON balancing_reserves(reserve_type);
-            """
-            
-            day_ahead_prices_indexes = """
-            CREATE INDEX IF NOT EXISTS idx_day_ahead_prices_datetime 
-            ON day_ahead_prices(datetime_utc);
-            
-            CREATE INDEX IF NOT EXISTS idx_day_ahead_prices_country 
-            ON day_ahead_prices(country_code);
-            """
-            
-            with engine.connect() as conn:
-                # Create tables
-                conn.execute(text(balancing_reserves_sql))
-                conn.execute(text(day_ahead_prices_sql))
+            with engine.begin() as conn:
+                # Create both tables in one round-trip
+                conn.exec_driver_sql(balancing_reserves_sql + day_ahead_prices_sql)
+                
+                # Tables created as NUMERIC elsewhere are migrated to the
+                # fixed-width float type the loaders COPY into
+                numeric_columns = conn.exec_driver_sql("""
+                    SELECT table_name, column_name FROM information_schema.columns
+                    WHERE table_schema = current_schema()
+                      AND data_type = 'numeric'
+                      AND (table_name, column_name) IN (
+                          ('balancing_reserves', 'amount_mw'),
+                          ('balancing_reserves', 'price_eur'),
+                          ('day_ahead_prices', 'price_eur_per_mwh')
+                      )
+                """).fetchall()
+                for table_name, column_name in numeric_columns:
+                    self.logger.info(f"Migrating {table_name}.{column_name} to DOUBLE PRECISION")
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                        f"TYPE DOUBLE PRECISION USING {column_name}::double precision"
+                    )
                 
-                # Create indexes
-                conn.execute(text(balancing_reserves_indexes))
-                conn.execute(text(day_ahead_prices_indexes))
+                existing = {row[0] for row in conn.exec_driver_sql(
+                    "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"
+                )}
                 
-                conn.commit()
+                # Tables created unpartitioned by earlier versions keep working
+                for table in ('balancing_reserves', 'day_ahead_prices'):
+                    self._partitioned[table] = self._is_partitioned(conn, table)
+                
+                # Partitioned parents cannot build indexes CONCURRENTLY; they
+                # hold no rows of their own, so build those here
+                missing = [name for name in _INDEXES if name not in existing]
+                for name in missing:
+                    if self._partitioned[_INDEXES[name].split('(')[0]]:
+                        conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON {_INDEXES[name]}")
+            
+            # Build the remaining missing indexes without blocking writers;
+            # CONCURRENTLY cannot run inside a transaction block, hence autocommit
+            missing = [name for name in missing if not self._partitioned[_INDEXES[name].split('(')[0]]]
+            if missing:
+                with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                    for name in missing:
+                        conn.exec_driver_sql(
+                            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {_INDEXES[name]}"
+                        )
             
             self.logger.info("Database tables created successfully")
             return True
@@ -127,74 +329,137 @@ class PostgresWriter:
             self.logger.error(f"Failed to create database tables: {e}")
             return False
     
-    def write_balancing_reserves(self, df: pd.DataFrame) -> bool:
+    @staticmethod
+    def _is_partitioned(conn, table: str) -> bool:
+        """Check whether a table is range-partitioned (relkind 'p')."""
+        return conn.exec_driver_sql(
+            "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%(table)s)",
+            {'table': table}
+        ).scalar() is True
+    
+    def ensure_partitions(self, table: str, start: datetime, end: datetime):
+        """
+        Create the monthly partitions of a table covering a time range.
+        Does nothing for tables that are not partitioned.
+        
+        Args:
+            table: Partitioned table name
+            start: Earliest datetime_utc to be loaded
+            end: Latest datetime_utc to be loaded
+        """
+        engine = self._get_engine()
+        
+        if table not in self._partitioned:
+            with engine.connect() as conn:
+                self._partitioned[table] = self._is_partitioned(conn, table)
+        if not self._partitioned[table]:
+            return
+        
+        month = start.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        end = end.astimezone(timezone.utc)
+        created = []
+        with engine.begin() as conn:
+            while month <= end:
+                next_month = (month + timedelta(days=32)).replace(day=1)
+                name = f"{table}_y{month:%Y}m{month:%m}"
+                if name not in self._partitions:
+                    conn.exec_driver_sql(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+                    )
+                    created.append(name)
+                month = next_month
+        
+        # Only remember partitions once their DDL has committed
+        self._partitions.update(created)
+    
+    def write_balancing_reserves(self, df: pd.DataFrame, mode: str = 'upsert') -> bool:
         """
         Write balancing reserves data to PostgreSQL.
         Updated for new schema with reserve_type and amount_mw.
         
         Args:
             df: DataFrame with balancing reserves data
+            mode: 'upsert' to merge over existing rows, or 'append' to COPY
+                straight into the table when none of the rows exist yet.
+                Either way each (country_code, datetime_utc, reserve_type)
+                may occur only once in the DataFrame
         
         Returns:
             True if write successful, False otherwise
         """
+        if mode not in ('upsert', 'append'):
+            raise ValueError(f"Unsupported write mode: {mode}")
+        
         if df.empty:
             self.logger.warning("Empty balancing reserves DataFrame provided")
             return True
         
-        # Validate DataFrame
-        required_columns = ['country_code', 'datetime_utc', 'reserve_type', 'amount_mw', 'inserted_at']
-        if not validate_dataframe(df, required_columns):
-            self.logger.error("Invalid balancing reserves DataFrame")
+        # Validate the schema only; Postgres enforces values during COPY
+        required_columns = ['country_code', 'datetime_utc', 'reserve_type', 'amount_mw']
+        missing_columns = set(required_columns) - set(df.columns)
+        if missing_columns:
+            self.logger.error(f"Invalid balancing reserves DataFrame, missing columns: {sorted(missing_columns)}")
             return False
         
         try:
             engine = self._get_engine()
             
-            # Prepare data for insertion
-            data_to_insert = []
-            for _, row in df.iterrows():
-                data_to_insert.append({
-                    'country_code': row['country_code'],
-                    'datetime_utc': row['datetime_utc'],
-                    'reserve_type': row['reserve_type'],
-                    'amount_mw': row['amount_mw'],
-                    'price_eur': row.get('price_eur'),
-                    'inserted_at': row['inserted_at']
-                })
+            # COPY selects the table columns itself; price_eur is optional
+            # and loads as NULL when absent
+            columns = _BALANCING_RESERVES_COLUMNS
+            if 'price_eur' not in df.columns:
+                df = df.assign(price_eur=None)
             
-            # Insert data using pandas to_sql with conflict resolution
-            df_to_insert = pd.DataFrame(data_to_insert)
+            self.ensure_partitions(
+                'balancing_reserves',
+                df['datetime_utc'].min().to_pydatetime(),
+                df['datetime_utc'].max().to_pydatetime()
+            )
             
-            with engine.connect() as conn:
-                # Use ON CONFLICT DO UPDATE for upsert behavior
-                df_to_insert.to_sql(
-                    'balancing_reserves_temp',
-                    conn,
-                    if_exists='replace',
-                    index=False,
-                    method='multi'
-                )
+            if mode == 'append':
+                # Nothing to merge against: COPY straight into the table.
+                # The caller must pass each key once; a row written since
+                # its existence check makes the COPY fail as a whole, and
+                # the batch is then merged below instead
+                try:
+                    with engine.begin() as conn:
+                        self._copy_df(conn, df, 'balancing_reserves', columns)
+                    self.logger.info(f"Successfully appended {len(df)} balancing reserves records")
+                    return True
+                except UniqueViolation as e:
+                    self.logger.warning(f"Append hit existing balancing reserves rows, retrying as upsert: "
+                                        f"{e.diag.message_primary}")
+            
+            # One transaction: stage rows with COPY, then merge with
+            # ON CONFLICT DO UPDATE; commit drops the staging table
+            with engine.begin() as conn:
+                conn.exec_driver_sql("""
+                CREATE TEMP TABLE balancing_reserves_temp (
+                    country_code VARCHAR(10),
+                    datetime_utc TIMESTAMP WITH TIME ZONE,
+                    reserve_type TEXT,
+                    amount_mw DOUBLE PRECISION,
+                    price_eur DOUBLE PRECISION
+                ) ON COMMIT DROP
+                """)
+                self._copy_df(conn, df, 'balancing_reserves_temp', columns)
                 
                 # Merge data using SQL
                 merge_sql = """
                 INSERT INTO balancing_reserves 
-                (country_code, datetime_utc, reserve_type, amount_mw, price_eur, inserted_at)
-                SELECT country_code, datetime_utc, reserve_type, amount_mw, price_eur, inserted_at
+                (country_code, datetime_utc, reserve_type, amount_mw, price_eur)
+                SELECT country_code, datetime_utc, reserve_type, amount_mw, price_eur
                 FROM balancing_reserves_temp
                 ON CONFLICT (country_code, datetime_utc, reserve_type)
                 DO UPDATE SET
                     amount_mw = EXCLUDED.amount_mw,
-                    price_eur = EXCLUDED.price_eur,
-                    inserted_at = EXCLUDED.inserted_at;
+                    price_eur = EXCLUDED.price_eur
+                WHERE balancing_reserves.amount_mw IS DISTINCT FROM EXCLUDED.amount_mw
+                   OR balancing_reserves.price_eur IS DISTINCT FROM EXCLUDED.price_eur;
                 """
                 
-                conn.execute(text(merge_sql))
-                
-                # Clean up temp table
-                conn.execute(text("DROP TABLE IF EXISTS balancing_reserves_temp"))
-                
-                conn.commit()
+                conn.exec_driver_sql(merge_sql)
             
             self.logger.info(f"Successfully wrote {len(df)} balancing reserves records")
             return True
@@ -203,70 +468,85 @@ class PostgresWriter:
             self.logger.error(f"Failed to write balancing reserves data: {e}")
             return False
     
-    def write_day_ahead_prices(self, df: pd.DataFrame) -> bool:
+    def write_day_ahead_prices(self, df: pd.DataFrame, mode: str = 'upsert') -> bool:
         """
         Write day-ahead prices data to PostgreSQL.
         
         Args:
             df: DataFrame with day-ahead prices data
+            mode: 'upsert' to merge over existing rows, or 'append' to COPY
+                straight into the table when none of the rows exist yet.
+                Either way each (country_code, datetime_utc) may occur only
+                once in the DataFrame
         
         Returns:
             True if write successful, False otherwise
         """
+        if mode not in ('upsert', 'append'):
+            raise ValueError(f"Unsupported write mode: {mode}")
+        
         if df.empty:
             self.logger.warning("Empty day-ahead prices DataFrame provided")
             return True
         
-        # Validate DataFrame
-        required_columns = ['country_code', 'datetime_utc', 'price_eur_per_mwh', 'inserted_at']
-        if not validate_dataframe(df, required_columns):
-            self.logger.error("Invalid day-ahead prices DataFrame")
+        # Validate the schema only; Postgres enforces values during COPY
+        required_columns = ['country_code', 'datetime_utc', 'price_eur_per_mwh']
+        missing_columns = set(required_columns) - set(df.columns)
+        if missing_columns:
+            self.logger.error(f"Invalid day-ahead prices DataFrame, missing columns: {sorted(missing_columns)}")
             return False
         
         try:
             engine = self._get_engine()
             
-            # Prepare data for insertion
-            data_to_insert = []
-            for _, row in df.iterrows():
-                data_to_insert.append({
-                    'country_code': row['country_code'],
-                    'datetime_utc': row['datetime_utc'],
-                    'price_eur_per_mwh': row['price_eur_per_mwh'],
-                    'inserted_at': row['inserted_at']
-                })
+            # COPY selects the table columns itself
+            columns = _DAY_AHEAD_PRICES_COLUMNS
             
-            # Insert data using pandas to_sql with conflict resolution
-            df_to_insert = pd.DataFrame(data_to_insert)
+            self.ensure_partitions(
+                'day_ahead_prices',
+                df['datetime_utc'].min().to_pydatetime(),
+                df['datetime_utc'].max().to_pydatetime()
+            )
             
-            with engine.connect() as conn:
-                # Use ON CONFLICT DO UPDATE for upsert behavior
-                df_to_insert.to_sql(
-                    'day_ahead_prices_temp',
-                    conn,
-                    if_exists='replace',
-                    index=False,
-                    method='multi'
-                )
+            if mode == 'append':
+                # Nothing to merge against: COPY straight into the table.
+                # The caller must pass each key once; a row written since
+                # its existence check makes the COPY fail as a whole, and
+                # the batch is then merged below instead
+                try:
+                    with engine.begin() as conn:
+                        self._copy_df(conn, df, 'day_ahead_prices', columns)
+                    self.logger.info(f"Successfully appended {len(df)} day-ahead prices records")
+                    return True
+                except UniqueViolation as e:
+                    self.logger.warning(f"Append hit existing day-ahead prices rows, retrying as upsert: "
+                                        f"{e.diag.message_primary}")
+            
+            # One transaction: stage rows with COPY, then merge with
+            # ON CONFLICT DO UPDATE; commit drops the staging table
+            with engine.begin() as conn:
+                conn.exec_driver_sql("""
+                CREATE TEMP TABLE day_ahead_prices_temp (
+                    country_code VARCHAR(10),
+                    datetime_utc TIMESTAMP WITH TIME ZONE,
+                    price_eur_per_mwh DOUBLE PRECISION
+                ) ON COMMIT DROP
+                """)
+                self._copy_df(conn, df, 'day_ahead_prices_temp', columns)
                 
                 # Merge data using SQL
                 merge_sql = """
                 INSERT INTO day_ahead_prices 
-                (country_code, datetime_utc, price_eur_per_mwh, inserted_at)
-                SELECT country_code, datetime_utc, price_eur_per_mwh, inserted_at
+                (country_code, datetime_utc, price_eur_per_mwh)
+                SELECT country_code, datetime_utc, price_eur_per_mwh
                 FROM day_ahead_prices_temp
                 ON CONFLICT (country_code, datetime_utc)
                 DO UPDATE SET
-                    price_eur_per_mwh = EXCLUDED.price_eur_per_mwh,
-                    inserted_at = EXCLUDED.inserted_at;
+                    price_eur_per_mwh = EXCLUDED.price_eur_per_mwh
+                WHERE day_ahead_prices.price_eur_per_mwh IS DISTINCT FROM EXCLUDED.price_eur_per_mwh;
                 """
                 
-                conn.execute(text(merge_sql))
-                
-                # Clean up temp table
-                conn.execute(text("DROP TABLE IF EXISTS day_ahead_prices_temp"))
-                
-                conn.commit()
+                conn.exec_driver_sql(merge_sql)
             
             self.logger.info(f"Successfully wrote {len(df)} day-ahead prices records")
             return True
@@ -275,52 +555,86 @@ class PostgresWriter:
             self.logger.error(f"Failed to write day-ahead prices data: {e}")
             return False
     
-    def get_table_stats(self) -> Dict[str, Any]:
+    def has_rows_between(self, table: str, country_code: str, start: datetime, end: datetime) -> bool:
+        """
+        Check whether a table holds any rows for a country in a time range.
+        
+        Args:
+            table: Table name (balancing_reserves or day_ahead_prices)
+            country_code: Country code to check
+            start: Earliest datetime_utc, inclusive
+            end: Latest datetime_utc, inclusive
+        
+        Returns:
+            True if at least one row exists in the range
+        """
+        if table not in ('balancing_reserves', 'day_ahead_prices'):
+            raise ValueError(f"Unknown table: {table}")
+        
+        engine = self._get_engine()
+        with engine.connect() as conn:
+            return bool(conn.execute(text(f"""
+                SELECT EXISTS (
+                    SELECT 1 FROM {table}
+                    WHERE country_code = :country_code
+                      AND datetime_utc BETWEEN :start AND :end
+                )
+            """), {'country_code': country_code, 'start': start, 'end': end}).scalar())
+    
+    def get_table_stats(self, estimate: bool = False) -> Dict[str, Any]:
         """
         Get statistics about the database tables.
         
+        Args:
+            estimate: Take row counts from the planner statistics in pg_class
+                instead of counting every row; the date range is still exact
+        
         Returns:
             Dictionary with table statistics
         """
+        if estimate:
+            return self._get_estimated_table_stats()
+        
         try:
             engine = self._get_engine()
             
             stats = {}
             
+            # Both tables are summarised in one round-trip
+            stats_sql = """
+                SELECT 
+                    'balancing_reserves' as table_name,
+                    COUNT(*) as total_records,
+                    MIN(datetime_utc) as earliest_date,
+                    MAX(datetime_utc) as latest_date,
+                    COUNT(DISTINCT reserve_type) as unique_reserve_types,
+                    NULL::double precision as avg_price
+                FROM balancing_reserves
+                UNION ALL
+                SELECT 
+                    'day_ahead_prices',
+                    COUNT(*),
+                    MIN(datetime_utc),
+                    MAX(datetime_utc),
+                    NULL,
+                    AVG(price_eur_per_mwh)
+                FROM day_ahead_prices
+            """
+            
             with engine.connect() as conn:
-                # Get balancing reserves stats
-                br_stats = conn.execute(text("""
-                    SELECT 
-                        COUNT(*) as total_records,
-                        MIN(datetime_utc) as earliest_date,
-                        MAX(datetime_utc) as latest_date,
-                        COUNT(DISTINCT reserve_type) as unique_reserve_types
-                    FROM balancing_reserves
-                """)).fetchone()
-                
-                stats['balancing_reserves'] = {
-                    'total_records': br_stats[0],
-                    'earliest_date': br_stats[1].isoformat() if br_stats[1] else None,
-                    'latest_date': br_stats[2].isoformat() if br_stats[2] else None,
-                    'unique_reserve_types': br_stats[3]
-                }
-                
-                # Get day-ahead prices stats
-                dap_stats = conn.execute(text("""
-                    SELECT 
-                        COUNT(*) as total_records,
-                        MIN(datetime_utc) as earliest_date,
-                        MAX(datetime_utc) as latest_date,
-                        AVG(price_eur_per_mwh) as avg_price
-                    FROM day_ahead_prices
-                """)).fetchone()
-                
-                stats['day_ahead_prices'] = {
-                    'total_records': dap_stats[0],
-                    'earliest_date': dap_stats[1].isoformat() if dap_stats[1] else None,
-                    'latest_date': dap_stats[2].isoformat() if dap_stats[2] else None,
-                    'avg_price': float(dap_stats[3]) if dap_stats[3] else None
+                rows = conn.execute(text(stats_sql)).fetchall()
+            
+            for table_name, total, earliest, latest, unique_types, avg_price in rows:
+                table_stats = {
+                    'total_records': total,
+                    'earliest_date': earliest.isoformat() if earliest else None,
+                    'latest_date': latest.isoformat() if latest else None
                 }
+                if table_name == 'balancing_reserves':
+                    table_stats['unique_reserve_types'] = unique_types
+                else:
+                    table_stats['avg_price'] = float(avg_price) if avg_price else None
+                stats[table_name] = table_stats
             
             return stats
             
@@ -328,6 +642,68 @@ class PostgresWriter:
             self.logger.error(f"Failed to get table stats: {e}")
             return {}
     
+    def _get_estimated_table_stats(self) -> Dict[str, Any]:
+        """
+        Get row estimates and date ranges without scanning the tables.
+        Estimates are summed over a table's partitions (the partitioned
+        parent holds no rows of its own) and are as fresh as the last
+        ANALYZE; MIN/MAX are served by the datetime_utc indexes.
+        
+        Returns:
+            Dictionary with table statistics
+        """
+        try:
+            engine = self._get_engine()
+            
+            stats_sql = " UNION ALL ".join(f"""
+                SELECT 
+                    '{table}' as table_name,
+                    (SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint
+                     FROM pg_class c
+                     WHERE c.relkind = 'r'
+                       AND (c.oid = to_regclass('{table}')
+                            OR c.oid IN (SELECT inhrelid FROM pg_inherits
+                                         WHERE inhparent = to_regclass('{table}')))) as total_records,
+                    (SELECT MIN(datetime_utc) FROM {table}) as earliest_date,
+                    (SELECT MAX(datetime_utc) FROM {table}) as latest_date
+            """ for table in ('balancing_reserves', 'day_ahead_prices'))
+            
+            with engine.connect() as conn:
+                rows = conn.execute(text(stats_sql)).fetchall()
+            
+            return {
+                table_name: {
+                    'total_records': total,
+                    'earliest_date': earliest.isoformat() if earliest else None,
+                    'latest_date': latest.isoformat() if latest else None
+                }
+                for table_name, total, earliest, latest in rows
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get estimated table stats: {e}")
+            return {}
+    
+    def analyze_tables(self) -> bool:
+        """
+        Refresh planner statistics after a bulk load.
+        COPY does not update them, and row estimates read from pg_class.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            engine = self._get_engine()
+            with engine.begin() as conn:
+                conn.exec_driver_sql("ANALYZE balancing_reserves, day_ahead_prices")
+            
+            self.logger.info("Table statistics refreshed")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to analyze tables: {e}")
+            return False
+    
     def close_connection(self):
         """Close database connection."""
         if self.engine:
@@ -5,12 +5,35 @@ Updated for new schema with reserve_type and amount_mw columns.
 """
 
 import logging
+import numpy as np
 import pandas as pd
-from datetime import datetime, timezone
 from typing import Optional, List
-import pytz
 
-from utils import normalize_utc_time, safe_float, validate_dataframe
+from utils import normalize_utc_series, safe_float_array, validate_dataframe
+
+# Per data_type cleaning and validation rules, resolved once at import so
+# transforming and validating a frame is a dictionary lookup, not a branch
+# chain. value_check pairs a column with the ufunc comparing it against 0.
+_RECORD_SCHEMAS = {
+    'balancing_reserves': {
+        'label': 'balancing reserves',
+        'required_columns': ['country_code', 'datetime_utc', 'reserve_type', 'amount_mw'],
+        'numeric_columns': ('amount_mw', 'price_eur'),
+        'category_columns': ('country_code', 'reserve_type'),
+        'not_null_columns': ('reserve_type',),
+        'value_check': ('amount_mw', np.greater),
+        'key_columns': ['country_code', 'datetime_utc', 'reserve_type'],
+    },
+    'day_ahead_prices': {
+        'label': 'day-ahead prices',
+        'required_columns': ['country_code', 'datetime_utc', 'price_eur_per_mwh'],
+        'numeric_columns': ('price_eur_per_mwh',),
+        'category_columns': ('country_code',),
+        'not_null_columns': (),
+        'value_check': ('price_eur_per_mwh', np.greater_equal),
+        'key_columns': ['country_code', 'datetime_utc'],
+    },
+}
 
 
 class DataTransformer:
@@ -30,40 +53,7 @@ class DataTransformer:
         Returns:
             Cleaned and transformed DataFrame
         """
-        if df.empty:
-            self.logger.warning("Empty balancing reserves DataFrame provided")
-            return df
-        
-        self.logger.info(f"Transforming {len(df)} balancing reserves records")
-        
-        try:
-            # Create a copy to avoid modifying original
-            df_transformed = df.copy()
-            
-            # Ensure datetime_utc is timezone-aware and in UTC
-            df_transformed['datetime_utc'] = df_transformed['datetime_utc'].apply(
-                lambda x: normalize_utc_time(x) if pd.notna(x) else x
-            )
-            
-            # Clean and validate numeric columns
-            df_transformed['amount_mw'] = df_transformed['amount_mw'].apply(safe_float)
-            df_transformed['price_eur'] = df_transformed['price_eur'].apply(safe_float)
-            
-            # Remove rows with invalid data
-            df_transformed = self._remove_invalid_records(df_transformed, 'balancing_reserves')
-            
-            # Add inserted_at timestamp
-            df_transformed['inserted_at'] = datetime.now(timezone.utc)
-            
-            # Sort by datetime
-            df_transformed = df_transformed.sort_values('datetime_utc').reset_index(drop=True)
-            
-            self.logger.info(f"Transformed {len(df_transformed)} valid balancing reserves records")
-            return df_transformed
-            
-        except Exception as e:
-            self.logger.error(f"Failed to transform balancing reserves data: {e}")
-            raise
+        return self._transform(df, 'balancing_reserves')
     
     def transform_day_ahead_prices(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -75,38 +65,57 @@ class DataTransformer:
         Returns:
             Cleaned and transformed DataFrame
         """
+        return self._transform(df, 'day_ahead_prices')
+    
+    def _transform(self, df: pd.DataFrame, data_type: str) -> pd.DataFrame:
+        """
+        Normalize, clean and sort raw data according to its schema entry.
+        
+        Args:
+            df: Raw DataFrame
+            data_type: Key into _RECORD_SCHEMAS
+        
+        Returns:
+            Cleaned and transformed DataFrame
+        """
+        schema = _RECORD_SCHEMAS[data_type]
+        label = schema['label']
+        
         if df.empty:
-            self.logger.warning("Empty day-ahead prices DataFrame provided")
+            self.logger.warning(f"Empty {label} DataFrame provided")
             return df
         
-        self.logger.info(f"Transforming {len(df)} day-ahead prices records")
+        self.logger.info(f"Transforming {len(df)} {label} records")
         
         try:
-            # Create a copy to avoid modifying original
-            df_transformed = df.copy()
+            # Shallow copy: every step below replaces whole columns or
+            # builds a new frame, so the caller's data is never modified
+            df_transformed = df.copy(deep=False)
             
             # Ensure datetime_utc is timezone-aware and in UTC
-            df_transformed['datetime_utc'] = df_transformed['datetime_utc'].apply(
-                lambda x: normalize_utc_time(x) if pd.notna(x) else x
-            )
+            df_transformed['datetime_utc'] = normalize_utc_series(df_transformed['datetime_utc'])
             
             # Clean and validate numeric columns
-            df_transformed['price_eur_per_mwh'] = df_transformed['price_eur_per_mwh'].apply(safe_float)
+            for column in schema['numeric_columns']:
+                df_transformed[column] = safe_float_array(df_transformed[column].to_numpy())
             
-            # Remove rows with invalid data
-            df_transformed = self._remove_invalid_records(df_transformed, 'day_ahead_prices')
+            # Low-cardinality keys as categoricals: de-duplication and the
+            # COPY encoder then work on integer codes instead of strings
+            for column in schema['category_columns']:
+                df_transformed[column] = df_transformed[column].astype('category')
             
-            # Add inserted_at timestamp
-            df_transformed['inserted_at'] = datetime.now(timezone.utc)
+            # Remove rows with invalid data
+            df_transformed = self._remove_invalid_records(df_transformed, data_type)
             
-            # Sort by datetime
-            df_transformed = df_transformed.sort_values('datetime_utc').reset_index(drop=True)
+            # Sort by datetime; the stable sort is near-linear on the
+            # already ordered per-series runs the API returns
+            df_transformed = df_transformed.sort_values('datetime_utc', kind='mergesort', ignore_index=True)
             
-            self.logger.info(f"Transformed {len(df_transformed)} valid day-ahead prices records")
+            self.logger.info(f"Transformed {len(df_transformed)} valid {label} records")
             return df_transformed
             
         except Exception as e:
-            self.logger.error(f"Failed to transform day-ahead prices data: {e}")
+            self.logger.error(f"Failed to transform {label} data: {e}")
             raise
     
     def _remove_invalid_records(self, df: pd.DataFrame, data_type: str) -> pd.DataFrame:
@@ -121,42 +130,28 @@ class DataTransformer:
             Cleaned DataFrame
         """
         initial_count = len(df)
-        
-        # Remove rows with missing datetime
-        df_clean = df.dropna(subset=['datetime_utc'])
-        
-        # Remove rows with missing country_code
-        df_clean = df_clean.dropna(subset=['country_code'])
-        
-        # Data type specific cleaning
-        if data_type == 'balancing_reserves':
-            # Remove rows with missing reserve_type
-            df_clean = df_clean.dropna(subset=['reserve_type'])
+        schema = _RECORD_SCHEMAS.get(data_type)
+        
+        # Build one mask for all row filters so the frame is only
+        # materialized once: rows need a datetime and a country code.
+        # Checks run on the backing arrays to skip the Series wrappers
+        valid = pd.notna(df['datetime_utc'].array)
+        valid &= pd.notna(df['country_code'].array)
+        
+        if schema is not None:
+            # Data type specific cleaning (NaN compares False)
+            for column in schema['not_null_columns']:
+                valid &= pd.notna(df[column].array)
+            value_column, value_check = schema['value_check']
+            valid &= value_check(df[value_column].to_numpy(dtype=np.float64, na_value=np.nan), 0)
             
-            # Remove rows with invalid amount (negative or zero)
-            df_clean = df_clean[
-                (df_clean['amount_mw'].notna()) & 
-                (df_clean['amount_mw'] > 0)
-            ]
-        
-        elif data_type == 'day_ahead_prices':
-            # Remove rows with invalid price (negative)
-            df_clean = df_clean[
-                (df_clean['price_eur_per_mwh'].notna()) & 
-                (df_clean['price_eur_per_mwh'] >= 0)
-            ]
+            # Drop duplicates among the valid rows, keeping the last one, by
+            # clearing their mask bits; only the key columns are hashed
+            valid_rows = np.flatnonzero(valid)
+            duplicated = df[schema['key_columns']].iloc[valid_rows].duplicated(keep='last').to_numpy()
+            valid[valid_rows[duplicated]] = False
         
-        # Remove duplicates based on key columns
-        if data_type == 'balancing_reserves':
-            df_clean = df_clean.drop_duplicates(
-                subset=['country_code', 'datetime_utc', 'reserve_type'],
-                keep='last'
-            )
-        elif data_type == 'day_ahead_prices':
-            df_clean = df_clean.drop_duplicates(
-                subset=['country_code', 'datetime_utc'],
-                keep='last'
-            )
+        df_clean = df[valid]
         
         removed_count = initial_count - len(df_clean)
         if removed_count > 0:
@@ -180,15 +175,12 @@ class DataTransformer:
             return False
         
         # Check required columns
-        if data_type == 'balancing_reserves':
-            required_columns = ['country_code', 'datetime_utc', 'reserve_type', 'amount_mw', 'inserted_at']
-        elif data_type == 'day_ahead_prices':
-            required_columns = ['country_code', 'datetime_utc', 'price_eur_per_mwh', 'inserted_at']
-        else:
+        schema = _RECORD_SCHEMAS.get(data_type)
+        if schema is None:
             self.logger.error(f"Unknown data type: {data_type}")
             return False
         
-        if not validate_dataframe(df, required_columns):
+        if not validate_dataframe(df, schema['required_columns']):
             self.logger.error(f"Missing required columns for {data_type}")
             return False
         
@@ -202,8 +194,8 @@ class DataTransformer:
             self.logger.error(f"datetime_utc column is not timezone-aware for {data_type}")
             return False
         
-        # Check for UTC timezone
-        if not all(dt.tzinfo == timezone.utc for dt in df['datetime_utc'] if pd.notna(dt)):
+        # Check for UTC timezone; a tz-aware column carries one tz for all rows
+        if str(df['datetime_utc'].dt.tz) != 'UTC':
             self.logger.error(f"datetime_utc column is not in UTC for {data_type}")
             return False
         
@@ -1,18 +1,26 @@
 """
 Utility functions for ENTSOE ETL pipeline.
-Includes date handling, logging, and retry mechanisms.
+Includes date handling, logging, and conversion helpers.
 Databricks-friendly utilities.
 """
 
 import logging
 import sys
 import os
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
-from typing import List, Tuple, Optional
-from tenacity import retry, stop_after_attempt, wait_exponential
-import pytz
+from typing import TYPE_CHECKING, List, Tuple, Optional, Iterable
+from zoneinfo import ZoneInfo
 
-from config import settings
+from config import get_settings
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+# Console handler shared by every setup_logging call
+_console_handler: Optional[logging.StreamHandler] = None
 
 
 def setup_logging(level: str = "INFO") -> logging.Logger:
@@ -26,31 +34,41 @@ def setup_logging(level: str = "INFO") -> logging.Logger:
     Returns:
         Configured logger instance
     """
-    logger = logging.getLogger("entsoe_etl")
-    logger.setLevel(getattr(logging, level.upper()))
+    global _console_handler
     
-    # Remove existing handlers to avoid duplicates
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
-    
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
+    logger = logging.getLogger("entsoe_etl")
+    log_level = getattr(logging, level.upper())
+    logger.setLevel(log_level)
     
-    # Create formatter - Databricks-friendly format
-    if settings.is_databricks:
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+    # Create console handler once; later calls only update its level and
+    # stream, since notebooks may swap sys.stdout between cells
+    if _console_handler is None:
+        _console_handler = logging.StreamHandler(sys.stdout)
+        
+        # Create formatter - Databricks-friendly format
+        if get_settings().is_databricks:
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+        else:
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+            )
+        
+        _console_handler.setFormatter(formatter)
     else:
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-        )
+        _console_handler.setStream(sys.stdout)
+    
+    _console_handler.setLevel(log_level)
     
-    console_handler.setFormatter(formatter)
+    # Remove other handlers to avoid duplicates
+    for handler in logger.handlers[:]:
+        if handler is not _console_handler:
+            logger.removeHandler(handler)
     
     # Add handler to logger
-    logger.addHandler(console_handler)
+    if _console_handler not in logger.handlers:
+        logger.addHandler(_console_handler)
     
     return logger
 
@@ -65,7 +83,7 @@ def get_databricks_file_path(relative_path: str) -> str:
     Returns:
         Absolute path suitable for Databricks
     """
-    if settings.is_databricks:
+    if get_settings().is_databricks:
         # In Databricks, files are typically in /Workspace/Repos/...
         workspace_path = os.environ.get('DATABRICKS_WORKSPACE_PATH', '/Workspace')
         repo_name = os.environ.get('DATABRICKS_REPO_NAME', 'entsoe-etl-databricks')
@@ -89,13 +107,7 @@ def get_date_range(start_date: str, end_date: str) -> List[datetime]:
     start = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
     end = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
     
-    dates = []
-    current = start
-    while current <= end:
-        dates.append(current)
-        current += timedelta(days=1)
-    
-    return dates
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
 
 
 def get_yesterday_utc() -> datetime:
@@ -108,6 +120,12 @@ def get_yesterday_utc() -> datetime:
     return datetime.now(timezone.utc) - timedelta(days=1)
 
 
+@lru_cache(maxsize=None)
+def _get_timezone(timezone_str: str) -> ZoneInfo:
+    """Look up a timezone once per name."""
+    return ZoneInfo(timezone_str)
+
+
 def normalize_utc_time(dt: datetime, timezone_str: str = "Europe/Berlin") -> datetime:
     """
     Normalize datetime to UTC, handling DST conversion.
@@ -120,13 +138,52 @@ def normalize_utc_time(dt: datetime, timezone_str: str = "Europe/Berlin") -> dat
         Datetime object in UTC
     """
     if dt.tzinfo is None:
-        # Assume local timezone if no timezone info
-        local_tz = pytz.timezone(timezone_str)
-        dt = local_tz.localize(dt)
+        # Assume local timezone if no timezone info. Ambiguous and
+        # nonexistent wall times take the fold with standard-time
+        # (non-DST) offset, as pytz's localize(is_dst=False) did
+        local_tz = _get_timezone(timezone_str)
+        dt = dt.replace(tzinfo=local_tz, fold=0)
+        other = dt.replace(fold=1)
+        if other.dst() < dt.dst():
+            dt = other
     
     return dt.astimezone(timezone.utc)
 
 
+def normalize_utc_series(values: 'pd.Series', timezone_str: str = "Europe/Berlin") -> 'pd.Series':
+    """
+    Normalize a whole datetime column to UTC in one vectorized pass.
+    Naive values are localized the way normalize_utc_time localizes them:
+    ambiguous autumn times resolve to standard time and nonexistent spring
+    times move forward by the DST offset.
+    
+    Args:
+        values: Series of datetimes (assumed to be in local timezone if naive)
+        timezone_str: Timezone string (default: Europe/Berlin for Germany)
+    
+    Returns:
+        Timezone-aware UTC datetime Series
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        try:
+            values = pd.to_datetime(values)
+        except (ValueError, TypeError):
+            # Mixed naive and aware objects: fall back to the scalar path
+            return values.apply(lambda x: normalize_utc_time(x, timezone_str) if pd.notna(x) else x)
+    
+    if values.dt.tz is None:
+        values = values.dt.tz_localize(
+            timezone_str,
+            ambiguous=np.zeros(len(values), dtype=bool),
+            nonexistent=pd.Timedelta(hours=1)
+        )
+    
+    return values.dt.tz_convert('UTC')
+
+
 def parse_date_argument(date_arg: str) -> Tuple[datetime, datetime]:
     """
     Parse date argument and return start/end dates.
@@ -165,26 +222,27 @@ def safe_float(value: str) -> Optional[float]:
         return None
 
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10)
-)
-def retry_function(func, *args, **kwargs):
+def safe_float_array(values: Iterable) -> 'np.ndarray':
     """
-    Retry wrapper for functions that may fail due to network issues.
+    Convert a sequence of strings to floats in one vectorized pass.
+    Values that cannot be converted become NaN, mirroring safe_float.
     
     Args:
-        func: Function to retry
-        *args: Function arguments
-        **kwargs: Function keyword arguments
+        values: Iterable of string values to convert
     
     Returns:
-        Function result
-    
-    Raises:
-        Exception: If all retries fail
+        Float64 array
     """
-    return func(*args, **kwargs)
+    import numpy as np
+    
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+    try:
+        # Fast path: numpy parses numeric strings and maps None to NaN
+        return np.array(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        import pandas as pd
+        return np.asarray(pd.to_numeric(values, errors='coerce'), dtype=np.float64)
 
 
 def validate_dataframe(df, required_columns: List[str]) -> bool:
@@ -216,7 +274,7 @@ def get_databricks_info() -> dict:
         Dictionary with Databricks environment details
     """
     info = {
-        'is_databricks': settings.is_databricks,
+        'is_databricks': get_settings().is_databricks,
         'runtime_version': os.environ.get('DATABRICKS_RUNTIME_VERSION'),
         'workspace_url': os.environ.get('DATABRICKS_WORKSPACE_URL'),
         'cluster_id': os.environ.get('DATABRICKS_CLUSTER_ID'),
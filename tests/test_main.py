@@ -0,0 +1,120 @@
+"""
+Unit tests for the ETL pipeline orchestrator.
+Tests the historical run with mocked API client and loader.
+"""
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+import pandas as pd
+from datetime import timedelta, timezone
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import ENTSOEETLPipeline
+
+
+def _balancing_reserves_frame(start, hours, amount):
+    """Build a raw balancing reserves frame of hourly FCR rows."""
+    return pd.DataFrame({
+        'datetime_utc': [start + timedelta(hours=hour) for hour in range(hours)],
+        'country_code': 'DE',
+        'reserve_type': 'FCR',
+        'amount_mw': float(amount),
+        'price_eur': 10.0
+    })
+
+
+class TestHistoricalETL(unittest.TestCase):
+    """Test cases for ENTSOEETLPipeline.run_historical_etl."""
+    
+    def setUp(self):
+        """Build a pipeline whose API client and loader are mocks."""
+        mock_settings = Mock()
+        mock_settings.log_level = 'INFO'
+        mock_settings.is_databricks = False
+        mock_settings.etl_parallelism = 3
+        
+        # utils imports get_settings by name as well, for setup_logging
+        for target in ('main.get_settings', 'utils.get_settings'):
+            patcher = patch(target, return_value=mock_settings)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for target in ('main.ENTSOEAPIClient', 'main.PostgresWriter'):
+            patcher = patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.pipeline = ENTSOEETLPipeline(country_code='DE')
+        self.loader = self.pipeline.loader
+        self.loader.test_connection.return_value = True
+        self.loader.create_tables.return_value = True
+        self.loader.has_rows_between.return_value = False
+        self.loader.write_balancing_reserves.return_value = True
+        self.loader.write_day_ahead_prices.return_value = True
+        self.pipeline.api_client.get_day_ahead_prices_range.return_value = pd.DataFrame()
+        
+        # A real request pool, like the client's, for fetches to run in
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='entsoe-api')
+        self.addCleanup(executor.shutdown)
+        self.pipeline.api_client.executor = executor
+    
+    def test_overlapping_days_are_loaded_once(self):
+        """Test boundary rows shared by adjacent days reach the loader once."""
+        def get_balancing_reserves(date):
+            # Each response also covers the first two hours of the next
+            # day; the amount tags the requested date
+            start = date.replace(tzinfo=timezone.utc)
+            return _balancing_reserves_frame(start, 26, date.day)
+        
+        self.pipeline.api_client.get_balancing_reserves.side_effect = get_balancing_reserves
+        
+        result = self.pipeline.run_historical_etl('2024-01-01', '2024-01-03', analyze=False)
+        
+        self.assertTrue(result)
+        self.loader.write_balancing_reserves.assert_called_once()
+        loaded = self.loader.write_balancing_reserves.call_args.args[0]
+        self.assertEqual(self.loader.write_balancing_reserves.call_args.kwargs['mode'], 'append')
+        
+        keys = ['country_code', 'datetime_utc', 'reserve_type']
+        self.assertEqual(len(loaded), 3 * 24 + 2)
+        self.assertFalse(loaded.duplicated(subset=keys).any())
+        
+        # The later day's copy of a shared row wins, whatever order the
+        # workers finished in
+        boundary = loaded[loaded['datetime_utc'] == pd.Timestamp('2024-01-02T00:00:00Z')]
+        self.assertEqual(boundary['amount_mw'].tolist(), [2.0])
+        boundary = loaded[loaded['datetime_utc'] == pd.Timestamp('2024-01-03T01:00:00Z')]
+        self.assertEqual(boundary['amount_mw'].tolist(), [3.0])
+
+    
+    def test_fetches_run_in_client_request_pool(self):
+        """Test API calls go through the client's request pool, not the ETL workers."""
+        fetch_threads = []
+        
+        def get_balancing_reserves(date):
+            fetch_threads.append(threading.current_thread().name)
+            return _balancing_reserves_frame(date.replace(tzinfo=timezone.utc), 24, date.day)
+        
+        def get_day_ahead_prices_range(start, end):
+            fetch_threads.append(threading.current_thread().name)
+            return pd.DataFrame()
+        
+        api_client = self.pipeline.api_client
+        api_client.get_balancing_reserves.side_effect = get_balancing_reserves
+        api_client.get_day_ahead_prices_range.side_effect = get_day_ahead_prices_range
+        
+        result = self.pipeline.run_historical_etl('2024-01-01', '2024-01-05', analyze=False)
+        
+        self.assertTrue(result)
+        self.assertEqual(len(fetch_threads), 6)
+        for name in fetch_threads:
+            self.assertTrue(name.startswith('entsoe-api'), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
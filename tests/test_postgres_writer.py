@@ -0,0 +1,230 @@
+"""
+Unit tests for the COPY BINARY encoder of the PostgreSQL writer.
+Decodes the produced bytes without a database.
+"""
+
+import struct
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from postgres_writer import (
+    PostgresWriter, _ChunkReader, _binary_fields, _BALANCING_RESERVES_COLUMNS,
+    _COPY_BINARY_HEADER, _COPY_CHUNK_ROWS, _NULL_FIELD
+)
+
+PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def _decode_field(field, pg_type):
+    """Decode one length-prefixed COPY BINARY field, None for NULL."""
+    (length,) = struct.unpack('>i', field[:4])
+    if length == -1:
+        return None
+    value = field[4:4 + length]
+    if pg_type == 'text':
+        return value.decode('utf-8')
+    if pg_type == 'float8':
+        return struct.unpack('>d', value)[0]
+    (micros,) = struct.unpack('>q', value)
+    return micros
+
+
+def _decode_stream(data, pg_types):
+    """Decode a whole COPY BINARY stream into a list of row tuples."""
+    assert data.startswith(_COPY_BINARY_HEADER)
+    pos = len(_COPY_BINARY_HEADER)
+    rows = []
+    while True:
+        (field_count,) = struct.unpack('>h', data[pos:pos + 2])
+        pos += 2
+        if field_count == -1:
+            break
+        assert field_count == len(pg_types)
+        row = []
+        for pg_type in pg_types:
+            (length,) = struct.unpack('>i', data[pos:pos + 4])
+            size = 4 + max(length, 0)
+            row.append(_decode_field(data[pos:pos + size], pg_type))
+            pos += size
+        rows.append(tuple(row))
+    assert pos == len(data), "trailing bytes after the COPY trailer"
+    return rows
+
+
+class TestBinaryFields(unittest.TestCase):
+    """Test cases for _binary_fields."""
+    
+    def test_timestamptz_counts_microseconds_from_2000(self):
+        """Test timestamps encode as microseconds since 2000-01-01 UTC."""
+        values = pd.Series(pd.to_datetime([
+            '2000-01-01T00:00:00Z',
+            '2024-01-01T00:15:00.000001Z',
+            '1999-12-31T23:59:59Z',
+        ], format='ISO8601'))
+        
+        fields = _binary_fields(values, 'timestamptz')
+        
+        self.assertEqual([len(field) for field in fields], [12, 12, 12])
+        self.assertEqual(_decode_field(fields[0], 'timestamptz'), 0)
+        expected = datetime(2024, 1, 1, 0, 15, 0, 1, tzinfo=timezone.utc) - PG_EPOCH
+        self.assertEqual(_decode_field(fields[1], 'timestamptz'), expected // pd.Timedelta(microseconds=1))
+        self.assertEqual(_decode_field(fields[2], 'timestamptz'), -1000000)
+    
+    def test_timestamptz_converts_other_zones_to_utc(self):
+        """Test a non-UTC aware timestamp encodes its UTC instant."""
+        values = pd.Series(pd.to_datetime(['2000-01-01T01:00:00']).tz_localize('Europe/Berlin'))
+        
+        fields = _binary_fields(values, 'timestamptz')
+        
+        self.assertEqual(_decode_field(fields[0], 'timestamptz'), 0)
+    
+    def test_timestamptz_nat_is_null(self):
+        """Test NaT encodes as the NULL marker."""
+        values = pd.Series(pd.to_datetime(['2024-01-01T00:00:00Z', None]))
+        
+        fields = _binary_fields(values, 'timestamptz')
+        
+        self.assertIsNotNone(_decode_field(fields[0], 'timestamptz'))
+        self.assertEqual(fields[1], _NULL_FIELD)
+    
+    def test_float8_missing_values_are_null(self):
+        """Test NaN and None encode as NULL and other values round-trip."""
+        for values in (pd.Series([1.5, np.nan, -0.25]), pd.Series([1.5, None, -0.25], dtype=object)):
+            with self.subTest(dtype=str(values.dtype)):
+                fields = _binary_fields(values, 'float8')
+                
+                decoded = [_decode_field(field, 'float8') for field in fields]
+                self.assertEqual(decoded, [1.5, None, -0.25])
+                self.assertEqual(fields[1], _NULL_FIELD)
+    
+    def test_text_lookup_and_nulls(self):
+        """Test strings are length-prefixed UTF-8 and missing values are NULL."""
+        cases = {
+            'object': pd.Series(['FCR', None, 'aFRR', 'FCR', 'Ørsted']),
+            'category': pd.Series(['FCR', None, 'aFRR', 'FCR', 'Ørsted'], dtype='category'),
+        }
+        for name, values in cases.items():
+            with self.subTest(dtype=name):
+                fields = _binary_fields(values, 'text')
+                
+                decoded = [_decode_field(field, 'text') for field in fields]
+                self.assertEqual(decoded, ['FCR', None, 'aFRR', 'FCR', 'Ørsted'])
+                self.assertEqual(fields[1], _NULL_FIELD)
+                self.assertEqual(struct.unpack('>i', fields[4][:4])[0], len('Ørsted'.encode('utf-8')))
+    
+    def test_text_unused_categories_are_skipped(self):
+        """Test categorical codes map to the right strings when categories go unused."""
+        values = pd.Categorical(['mFRR', None, 'FCR'], categories=['FCR', 'aFRR', 'mFRR'])
+        
+        fields = _binary_fields(pd.Series(values), 'text')
+        
+        self.assertEqual([_decode_field(field, 'text') for field in fields], ['mFRR', None, 'FCR'])
+    
+    def test_unsupported_type(self):
+        """Test an unknown wire type raises ValueError."""
+        with self.assertRaises(ValueError):
+            _binary_fields(pd.Series([1]), 'int4')
+
+
+class TestChunkReader(unittest.TestCase):
+    """Test cases for _ChunkReader."""
+    
+    def test_read_sizes_across_chunk_boundaries(self):
+        """Test fixed-size reads span, split and skip empty chunks."""
+        for size in (1, 2, 3, 4, 7, 100):
+            with self.subTest(size=size):
+                reader = _ChunkReader(iter([b'abc', b'', b'defg', b'h']), b'')
+                
+                parts = []
+                while True:
+                    part = reader.read(size)
+                    if not part:
+                        break
+                    self.assertLessEqual(len(part), size)
+                    parts.append(part)
+                
+                self.assertEqual(b''.join(parts), b'abcdefgh')
+                self.assertEqual(reader.read(size), b'')
+    
+    def test_read_all(self):
+        """Test read() without a size drains the remaining chunks."""
+        reader = _ChunkReader(iter([b'abc', b'de', b'f']), b'')
+        
+        self.assertEqual(reader.read(2), b'ab')
+        self.assertEqual(reader.read(), b'cdef')
+        self.assertEqual(reader.read(), b'')
+    
+    def test_text_chunks(self):
+        """Test str chunks are joined as str with the default empty value."""
+        reader = _ChunkReader(iter(['ab', 'cd']))
+        
+        self.assertEqual(reader.read(3), 'abc')
+        self.assertEqual(reader.read(), 'd')
+
+
+class TestCopyStream(unittest.TestCase):
+    """Test cases for the stream PostgresWriter._copy_df sends."""
+    
+    def _copy(self, df, columns):
+        """Run _copy_df against a mock connection and return the bytes sent."""
+        sent = {}
+        
+        def copy_expert(sql, file, size):
+            sent['sql'] = sql
+            chunks = []
+            while True:
+                chunk = file.read(size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            sent['data'] = b''.join(chunks)
+        
+        conn = MagicMock()
+        cursor = conn.connection.cursor.return_value.__enter__.return_value
+        cursor.copy_expert.side_effect = copy_expert
+        
+        writer = PostgresWriter.__new__(PostgresWriter)
+        writer._copy_df(conn, df, 'balancing_reserves', columns)
+        return sent
+    
+    def test_rows_round_trip_across_copy_chunks(self):
+        """Test every row decodes intact when the frame spans several chunks."""
+        count = _COPY_CHUNK_ROWS + 3
+        reserve_types = ['FCR', 'aFRR', None] * (count // 3) + ['FCR'] * (count % 3)
+        df = pd.DataFrame({
+            'country_code': pd.Categorical(['DE'] * count),
+            'datetime_utc': pd.date_range('2000-01-01', periods=count, freq='15min', tz='UTC'),
+            'reserve_type': reserve_types,
+            'amount_mw': np.arange(count, dtype=np.float64),
+            'price_eur': np.nan,
+        })
+        
+        sent = self._copy(df, _BALANCING_RESERVES_COLUMNS)
+        
+        self.assertEqual(
+            sent['sql'],
+            "COPY balancing_reserves (country_code, datetime_utc, reserve_type, amount_mw, price_eur) "
+            "FROM STDIN WITH (FORMAT BINARY)"
+        )
+        rows = _decode_stream(sent['data'], list(_BALANCING_RESERVES_COLUMNS.values()))
+        self.assertEqual(len(rows), count)
+        for index in (0, 1, 2, _COPY_CHUNK_ROWS - 1, _COPY_CHUNK_ROWS, count - 1):
+            expected = (
+                'DE',
+                index * 15 * 60 * 1000000,
+                reserve_types[index],
+                float(index),
+                None,
+            )
+            self.assertEqual(rows[index], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
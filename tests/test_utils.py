@@ -0,0 +1,94 @@
+"""
+Unit tests for the UTC normalization helpers.
+Tests DST edge cases for the scalar and vectorized paths.
+"""
+
+import unittest
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import normalize_utc_series, normalize_utc_time
+
+
+# Naive Europe/Berlin wall times and the UTC instant each one maps to.
+# Ambiguous autumn times take standard time (CET) and nonexistent spring
+# times are read with the pre-transition offset, as pytz's
+# localize(is_dst=False) did
+DST_CASES = {
+    'winter': (datetime(2024, 1, 15, 12, 0), datetime(2024, 1, 15, 11, 0, tzinfo=timezone.utc)),
+    'summer': (datetime(2024, 7, 15, 12, 0), datetime(2024, 7, 15, 10, 0, tzinfo=timezone.utc)),
+    'ambiguous autumn hour': (datetime(2024, 10, 27, 2, 30), datetime(2024, 10, 27, 1, 30, tzinfo=timezone.utc)),
+    'nonexistent spring hour': (datetime(2024, 3, 31, 2, 30), datetime(2024, 3, 31, 1, 30, tzinfo=timezone.utc)),
+}
+
+
+def _quarter_hours(day):
+    """Naive quarter-hour wall times covering one local day."""
+    start = datetime.strptime(day, '%Y-%m-%d')
+    return [start + timedelta(minutes=15 * step) for step in range(96)]
+
+
+class TestNormalizeUTC(unittest.TestCase):
+    """Test cases for normalize_utc_time and normalize_utc_series."""
+    
+    def test_scalar_dst_edges(self):
+        """Test normalize_utc_time on DST edge cases."""
+        for name, (local, expected) in DST_CASES.items():
+            with self.subTest(name):
+                self.assertEqual(normalize_utc_time(local), expected)
+    
+    def test_series_dst_edges(self):
+        """Test normalize_utc_series on DST edge cases."""
+        names = list(DST_CASES)
+        values = pd.Series([DST_CASES[name][0] for name in names])
+        
+        result = normalize_utc_series(values)
+        
+        self.assertEqual(str(result.dt.tz), 'UTC')
+        for name, value in zip(names, result):
+            with self.subTest(name):
+                self.assertEqual(value.to_pydatetime(), DST_CASES[name][1])
+    
+    def test_aware_values_are_converted(self):
+        """Test aware datetimes keep their instant rather than being relocalized."""
+        aware = datetime(2024, 10, 27, 2, 30, tzinfo=timezone(timedelta(hours=2)))
+        expected = datetime(2024, 10, 27, 0, 30, tzinfo=timezone.utc)
+        
+        self.assertEqual(normalize_utc_time(aware), expected)
+        self.assertEqual(normalize_utc_series(pd.Series([aware])).iloc[0].to_pydatetime(), expected)
+    
+    def test_scalar_and_series_agree_on_transition_days(self):
+        """Test both paths agree for every quarter hour of both DST transition days."""
+        for day in ('2024-03-31', '2024-10-27'):
+            with self.subTest(day):
+                local = _quarter_hours(day)
+                
+                result = normalize_utc_series(pd.Series(local))
+                
+                self.assertEqual([value.to_pydatetime() for value in result],
+                                 [normalize_utc_time(value) for value in local])
+    
+    def test_mixed_naive_and_aware_fallback(self):
+        """Test the scalar fallback for mixed naive and aware values matches normalize_utc_time."""
+        values = [
+            DST_CASES['ambiguous autumn hour'][0],
+            datetime(2024, 3, 31, 2, 30, tzinfo=timezone.utc),
+            DST_CASES['nonexistent spring hour'][0],
+            None,
+        ]
+        
+        result = normalize_utc_series(pd.Series(values, dtype=object))
+        
+        self.assertEqual(len(result), len(values))
+        for value, normalized in zip(values[:-1], result.iloc[:-1]):
+            with self.subTest(value=value):
+                self.assertEqual(pd.Timestamp(normalized).to_pydatetime(), normalize_utc_time(value))
+        self.assertTrue(pd.isna(result.iloc[-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()